@@ -0,0 +1,42 @@
+"""cascade document deletes to chunks and query logs
+
+Revision ID: 3b8e6f0d2c41
+Revises: 7d2f4c1a9b3e
+Create Date: 2026-10-15 11:02:17.304851
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e6f0d2c41'
+down_revision: Union[str, Sequence[str], None] = '7d2f4c1a9b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEPENDENT_TABLES = ('chunks', 'query_logs')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in DEPENDENT_TABLES:
+        op.drop_constraint(f'{table}_document_id_fkey', table, type_='foreignkey')
+        op.create_foreign_key(
+            f'{table}_document_id_fkey',
+            table,
+            'documents',
+            ['document_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in DEPENDENT_TABLES:
+        op.drop_constraint(f'{table}_document_id_fkey', table, type_='foreignkey')
+        op.create_foreign_key(
+            f'{table}_document_id_fkey', table, 'documents', ['document_id'], ['id']
+        )
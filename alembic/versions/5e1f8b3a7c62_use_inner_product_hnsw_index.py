@@ -0,0 +1,40 @@
+"""use inner product hnsw index
+
+Revision ID: 5e1f8b3a7c62
+Revises: 9a4c2e7b5d10
+Create Date: 2026-10-15 13:41:52.620918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1f8b3a7c62'
+down_revision: Union[str, Sequence[str], None] = '9a4c2e7b5d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recreate_embedding_index(ops: str) -> None:
+    op.drop_index('ix_chunks_embedding', table_name='chunks', postgresql_using='hnsw')
+    op.create_index(
+        'ix_chunks_embedding',
+        'chunks',
+        ['embedding'],
+        unique=False,
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': ops},
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_embedding_index('halfvec_ip_ops')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_embedding_index('halfvec_cosine_ops')
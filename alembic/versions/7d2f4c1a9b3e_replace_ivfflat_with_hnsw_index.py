@@ -0,0 +1,43 @@
+"""replace ivfflat embedding index with hnsw
+
+Revision ID: 7d2f4c1a9b3e
+Revises: cf51b68c028e
+Create Date: 2026-10-15 10:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2f4c1a9b3e'
+down_revision: Union[str, Sequence[str], None] = 'cf51b68c028e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_chunks_embedding', table_name='chunks', postgresql_using='ivfflat')
+    op.create_index(
+        'ix_chunks_embedding',
+        'chunks',
+        ['embedding'],
+        unique=False,
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chunks_embedding', table_name='chunks', postgresql_using='hnsw')
+    op.create_index(
+        'ix_chunks_embedding',
+        'chunks',
+        ['embedding'],
+        unique=False,
+        postgresql_using='ivfflat',
+    )
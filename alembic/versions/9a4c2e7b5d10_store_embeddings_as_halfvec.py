@@ -0,0 +1,53 @@
+"""store embeddings as halfvec
+
+Revision ID: 9a4c2e7b5d10
+Revises: 3b8e6f0d2c41
+Create Date: 2026-10-15 12:20:05.117392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4c2e7b5d10'
+down_revision: Union[str, Sequence[str], None] = '3b8e6f0d2c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_chunks_embedding', table_name='chunks', postgresql_using='hnsw')
+    op.execute(
+        'ALTER TABLE chunks ALTER COLUMN embedding TYPE halfvec(1536) '
+        'USING embedding::halfvec(1536)'
+    )
+    op.create_index(
+        'ix_chunks_embedding',
+        'chunks',
+        ['embedding'],
+        unique=False,
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'halfvec_cosine_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chunks_embedding', table_name='chunks', postgresql_using='hnsw')
+    op.execute(
+        'ALTER TABLE chunks ALTER COLUMN embedding TYPE vector(1536) '
+        'USING embedding::vector(1536)'
+    )
+    op.create_index(
+        'ix_chunks_embedding',
+        'chunks',
+        ['embedding'],
+        unique=False,
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'},
+    )
@@ -14,6 +14,11 @@ case "$1" in
     uv run pytest tests/unit/ -v
     ;;
 
+  test-fast)
+    echo "Running unit tests (no pytest cache)..."
+    uv run pytest tests/unit/ -p no:cacheprovider --no-header -q
+    ;;
+
   test-all)
     echo "Running all tests..."
     uv run pytest -v
@@ -39,6 +44,11 @@ case "$1" in
     uv run alembic revision --autogenerate -m "$2"
     ;;
 
+  db-reindex)
+    echo "Rebuilding HNSW index if the chunk count changed tier..."
+    uv run python -m src.maintenance "${@:2}"
+    ;;
+
   db-reset)
     echo "Resetting database..."
     docker-compose down postgres
@@ -68,7 +78,7 @@ case "$1" in
     ;;
 
   *)
-    echo "Usage: ./scripts/dev.sh {start|test|test-all|coverage|db-migrate|db-revision|db-reset|lint|format|clean}"
+    echo "Usage: ./scripts/dev.sh {start|test|test-fast|test-all|coverage|db-migrate|db-revision|db-reindex|db-reset|lint|format|clean}"
     exit 1
     ;;
 esac
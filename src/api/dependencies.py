@@ -1,10 +1,13 @@
 """FastAPI dependencies for database and services."""
 
+import asyncio
+from functools import lru_cache
 from typing import AsyncGenerator
 
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+import httpx
+from fastapi import BackgroundTasks, Depends, Request
+from openai import AsyncOpenAI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from src.core.config import get_settings
 from src.repositories.document_repo import DocumentRepository
@@ -16,9 +19,15 @@ from src.services.llm_service import LLMService
 from src.services.pdf_service import PDFService
 from src.services.rag_service import RAGService
 from src.services.retrieval_service import RetrievalService
+from src.utils.cache import SemanticCache
 
-# Database engine (created once at startup)
+# Database engine and session factory (created once at startup)
 _engine = None
+_session_factory = None
+
+# Per-endpoint concurrency limits (created lazily from settings)
+_upload_semaphore = None
+_query_semaphore = None
 
 
 def get_engine():
@@ -26,29 +35,87 @@ def get_engine():
     global _engine
     if _engine is None:
         settings = get_settings()
-        _engine = create_async_engine(settings.database_url, echo=False)
+        _engine = create_async_engine(
+            settings.database_url,
+            echo=False,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_pre_ping=True,
+            pool_recycle=settings.db_pool_recycle,
+        )
     return _engine
 
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get or create the async session factory bound to the engine."""
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(
+            get_engine(), class_=AsyncSession, expire_on_commit=False
+        )
+    return _session_factory
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for database session.
 
+    Commits on success only when the session still holds pending ORM changes;
+    read-only requests skip the COMMIT round-trip. Repositories that issue
+    Core-level writes commit explicitly.
+
     Yields:
         AsyncSession instance
     """
-    engine = get_engine()
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    session_factory = get_session_factory()
 
-    async with async_session() as session:
+    async with session_factory() as session:
         try:
             yield session
-            await session.commit()
+            if session.new or session.dirty or session.deleted:
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
 
 
+def get_upload_semaphore() -> asyncio.Semaphore:
+    """Get or create the semaphore bounding concurrent uploads."""
+    global _upload_semaphore
+    if _upload_semaphore is None:
+        _upload_semaphore = asyncio.Semaphore(get_settings().max_concurrent_uploads)
+    return _upload_semaphore
+
+
+def get_query_semaphore() -> asyncio.Semaphore:
+    """Get or create the semaphore bounding concurrent queries."""
+    global _query_semaphore
+    if _query_semaphore is None:
+        _query_semaphore = asyncio.Semaphore(get_settings().max_concurrent_queries)
+    return _query_semaphore
+
+
+async def upload_slot() -> AsyncGenerator[None, None]:
+    """
+    Dependency that holds an upload slot for the duration of the request.
+
+    Excess uploads wait here instead of competing for pooled connections.
+    """
+    async with get_upload_semaphore():
+        yield
+
+
+async def query_slot() -> AsyncGenerator[None, None]:
+    """
+    Dependency that holds a query slot for the duration of the request.
+
+    Excess queries wait here instead of competing for pooled connections.
+    """
+    async with get_query_semaphore():
+        yield
+
+
 async def get_document_repo(
     session: AsyncSession = Depends(get_db_session),
 ) -> DocumentRepository:
@@ -76,7 +143,7 @@ async def get_vector_repo(
     Returns:
         VectorRepository instance
     """
-    return VectorRepository(session)
+    return VectorRepository(session, ef_search=get_settings().hnsw_ef_search)
 
 
 async def get_query_log_repo(
@@ -94,9 +161,34 @@ async def get_query_log_repo(
     return QueryLogRepository(session)
 
 
-def get_pdf_service() -> PDFService:
+@lru_cache(maxsize=1)
+def build_openai_client() -> AsyncOpenAI:
     """
-    Dependency for PDF service.
+    Build the shared AsyncOpenAI client for OpenRouter.
+
+    The underlying httpx connection pool is shared by embedding and LLM calls
+    so they keep warm keep-alive connections instead of re-doing TLS handshakes.
+    Rate limits, timeouts, connection errors and 5xx responses are retried by
+    the SDK with jittered exponential backoff.
+
+    Returns:
+        AsyncOpenAI instance
+    """
+    settings = get_settings()
+    return AsyncOpenAI(
+        api_key=settings.openrouter_api_key,
+        base_url=settings.openrouter_base_url,
+        max_retries=settings.openai_max_retries,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def build_pdf_service() -> PDFService:
+    """
+    Build the PDF service.
 
     Returns:
         PDFService instance
@@ -104,9 +196,10 @@ def get_pdf_service() -> PDFService:
     return PDFService()
 
 
-def get_chunking_service() -> ChunkingService:
+@lru_cache(maxsize=1)
+def build_chunking_service() -> ChunkingService:
     """
-    Dependency for chunking service.
+    Build the chunking service from settings.
 
     Returns:
         ChunkingService instance
@@ -115,39 +208,118 @@ def get_chunking_service() -> ChunkingService:
     return ChunkingService(chunk_size=settings.chunk_size, chunk_overlap=settings.chunk_overlap)
 
 
-def get_embedding_service() -> EmbeddingService:
+@lru_cache(maxsize=1)
+def build_embedding_service() -> EmbeddingService:
     """
-    Dependency for embedding service.
+    Build the embedding service from settings.
 
     Returns:
         EmbeddingService instance
     """
     settings = get_settings()
     return EmbeddingService(
-        api_key=settings.openrouter_api_key,
-        base_url=settings.openrouter_base_url,
         model=settings.embedding_model,
+        cache_size=settings.embedding_cache_size,
+        client=build_openai_client(),
     )
 
 
-def get_llm_service() -> LLMService:
+@lru_cache(maxsize=1)
+def build_llm_service() -> LLMService:
     """
-    Dependency for LLM service.
+    Build the LLM service from settings.
 
     Returns:
         LLMService instance
     """
+    return LLMService(model=get_settings().llm_model, client=build_openai_client())
+
+
+@lru_cache(maxsize=1)
+def build_semantic_cache() -> SemanticCache:
+    """
+    Build the process-wide semantic cache of retrieval results and answers.
+
+    Returns:
+        SemanticCache instance
+    """
     settings = get_settings()
-    return LLMService(
-        api_key=settings.openrouter_api_key,
-        base_url=settings.openrouter_base_url,
-        model=settings.llm_model,
+    return SemanticCache(
+        threshold=settings.semantic_cache_threshold,
+        max_size=settings.semantic_cache_size,
+        ttl_seconds=settings.semantic_cache_ttl_seconds,
     )
 
 
+def get_pdf_service(request: Request) -> PDFService:
+    """
+    Dependency for PDF service.
+
+    Args:
+        request: Current request, used to reach the app-wide singleton
+
+    Returns:
+        PDFService instance built at startup
+    """
+    return request.app.state.pdf_service
+
+
+def get_chunking_service(request: Request) -> ChunkingService:
+    """
+    Dependency for chunking service.
+
+    Args:
+        request: Current request, used to reach the app-wide singleton
+
+    Returns:
+        ChunkingService instance built at startup
+    """
+    return request.app.state.chunking_service
+
+
+def get_embedding_service(request: Request) -> EmbeddingService:
+    """
+    Dependency for embedding service.
+
+    Args:
+        request: Current request, used to reach the app-wide singleton
+
+    Returns:
+        EmbeddingService instance built at startup
+    """
+    return request.app.state.embedding_service
+
+
+def get_llm_service(request: Request) -> LLMService:
+    """
+    Dependency for LLM service.
+
+    Args:
+        request: Current request, used to reach the app-wide singleton
+
+    Returns:
+        LLMService instance built at startup
+    """
+    return request.app.state.llm_service
+
+
+def get_semantic_cache(request: Request) -> SemanticCache:
+    """
+    Dependency for the semantic retrieval cache.
+
+    Args:
+        request: Current request, used to reach the app-wide singleton
+
+    Returns:
+        SemanticCache instance built at startup
+    """
+    return request.app.state.semantic_cache
+
+
 async def get_retrieval_service(
     vector_repo: VectorRepository = Depends(get_vector_repo),
     embedding_service: EmbeddingService = Depends(get_embedding_service),
+    semantic_cache: SemanticCache = Depends(get_semantic_cache),
 ) -> RetrievalService:
     """
     Dependency for retrieval service.
@@ -155,6 +327,7 @@ async def get_retrieval_service(
     Args:
         vector_repo: Vector repository from get_vector_repo
         embedding_service: Embedding service from get_embedding_service
+        semantic_cache: Semantic cache from get_semantic_cache
 
     Returns:
         RetrievalService instance
@@ -165,23 +338,28 @@ async def get_retrieval_service(
         embedding_service=embedding_service,
         top_k=settings.top_k_results,
         min_similarity=settings.min_similarity_threshold,
+        semantic_cache=semantic_cache,
     )
 
 
 async def get_rag_service(
+    background_tasks: BackgroundTasks,
     retrieval_service: RetrievalService = Depends(get_retrieval_service),
     llm_service: LLMService = Depends(get_llm_service),
     query_log_repo: QueryLogRepository = Depends(get_query_log_repo),
     document_repo: DocumentRepository = Depends(get_document_repo),
+    semantic_cache: SemanticCache = Depends(get_semantic_cache),
 ) -> RAGService:
     """
     Dependency for RAG service.
 
     Args:
+        background_tasks: Request background tasks used to write query logs
         retrieval_service: Retrieval service from get_retrieval_service
         llm_service: LLM service from get_llm_service
         query_log_repo: Query log repository from get_query_log_repo
         document_repo: Document repository from get_document_repo
+        semantic_cache: Semantic cache from get_semantic_cache, shared with retrieval
 
     Returns:
         RAGService instance
@@ -191,4 +369,6 @@ async def get_rag_service(
         llm_service=llm_service,
         query_log_repo=query_log_repo,
         document_repo=document_repo,
+        background_tasks=background_tasks,
+        answer_cache=semantic_cache,
     )
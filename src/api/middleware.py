@@ -2,12 +2,12 @@
 
 import logging
 import time
-from typing import Callable
 
-from fastapi import Request, Response, status
+from fastapi import Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.utils.exceptions import (
     DocumentNotFoundError,
@@ -20,42 +20,57 @@ from src.utils.exceptions import (
 logger = logging.getLogger(__name__)
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
-    """Middleware for centralized error handling."""
+class ErrorHandlerMiddleware:
+    """ASGI middleware for centralized error handling."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Handle requests and catch exceptions."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
-        except DocumentNotFoundError as e:
-            return JSONResponse(
-                status_code=status.HTTP_404_NOT_FOUND,
-                content={"detail": str(e), "error_type": "DocumentNotFound"},
-            )
-        except InvalidFileTypeError as e:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={"detail": str(e), "error_type": "InvalidFileType"},
-            )
-        except FileSizeExceededError as e:
-            return JSONResponse(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                content={"detail": str(e), "error_type": "FileSizeExceeded"},
-            )
-        except PDFProcessingError as e:
-            return JSONResponse(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                content={"detail": str(e), "error_type": "PDFProcessingError"},
-            )
-        except RAGSystemError as e:
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={"detail": str(e), "error_type": "RAGSystemError"},
-            )
-        except Exception:
-            logger.exception("Unhandled exception")
-            return JSONResponse(
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            # Headers already sent: nothing sensible left to return
+            if response_started:
+                raise
+            response = self._build_error_response(e)
+            await response(scope, receive, send)
+
+    @staticmethod
+    def _build_error_response(error: Exception) -> Response:
+        """Map an exception to its JSON error response."""
+        if isinstance(error, DocumentNotFoundError):
+            status_code, error_type = status.HTTP_404_NOT_FOUND, "DocumentNotFound"
+        elif isinstance(error, InvalidFileTypeError):
+            status_code, error_type = status.HTTP_400_BAD_REQUEST, "InvalidFileType"
+        elif isinstance(error, FileSizeExceededError):
+            status_code, error_type = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "FileSizeExceeded"
+        elif isinstance(error, PDFProcessingError):
+            status_code, error_type = status.HTTP_422_UNPROCESSABLE_ENTITY, "PDFProcessingError"
+        elif isinstance(error, RAGSystemError):
+            status_code, error_type = status.HTTP_500_INTERNAL_SERVER_ERROR, "RAGSystemError"
+        else:
+            logger.exception("Unhandled exception", exc_info=error)
+            return ORJSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={
                     "detail": "Error interno del servidor",
@@ -63,43 +78,70 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                 },
             )
 
+        return ORJSONResponse(
+            status_code=status_code,
+            content={"detail": str(error), "error_type": error_type},
+        )
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for request/response logging."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Log request and response details."""
-        start_time = time.time()
+class RequestLoggingMiddleware:
+    """ASGI middleware for request/response logging."""
 
-        # Log request
-        logger.info(
-            f"Request: {request.method} {request.url.path}",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "client": request.client.host if request.client else None,
-            },
-        )
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+        """
+        self.app = app
 
-        # Process request
-        response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Log request and response details."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Calculate duration
-        duration = time.time() - start_time
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
 
-        # Log response
+        # Log request
         logger.info(
-            f"Response: {response.status_code} ({duration:.3f}s)",
+            "Request: %s %s",
+            method,
+            path,
             extra={
-                "status_code": response.status_code,
-                "duration_seconds": duration,
+                "method": method,
+                "path": path,
+                "client": client[0] if client else None,
             },
         )
 
-        # Add timing header
-        response.headers["X-Process-Time"] = f"{duration:.3f}"
-
-        return response
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Calculate duration
+                duration = time.perf_counter() - start_time
+                status_code = message["status"]
+
+                # Log response
+                logger.info(
+                    "Response: %d (%.3fs)",
+                    status_code,
+                    duration,
+                    extra={
+                        "status_code": status_code,
+                        "duration_seconds": duration,
+                    },
+                )
+
+                # Add timing header
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", f"{duration:.3f}")
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
 
 
 def add_cors_middleware(app):
@@ -7,7 +7,11 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from src.api.dependencies import (
     get_chunking_service,
@@ -15,22 +19,24 @@ from src.api.dependencies import (
     get_document_repo,
     get_embedding_service,
     get_pdf_service,
-    get_query_log_repo,
+    get_semantic_cache,
     get_vector_repo,
+    upload_slot,
 )
 from src.api.schemas import (
     DocumentListResponse,
     DocumentResponse,
     DocumentStatusResponse,
 )
+from src.core.config import Settings, get_settings
 from src.models.chunk import Chunk
 from src.models.document import Document, DocumentStatus
 from src.repositories.document_repo import DocumentRepository
-from src.repositories.query_log_repo import QueryLogRepository
-from src.repositories.vector_repo import VectorRepository
+from src.repositories.vector_repo import COPY_THRESHOLD, VectorRepository
 from src.services.chunking_service import ChunkingService
 from src.services.embedding_service import EmbeddingService
 from src.services.pdf_service import PDFService
+from src.utils.cache import SemanticCache
 from src.utils.exceptions import (
     FileSizeExceededError,
     InvalidFileTypeError,
@@ -42,6 +48,79 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
+# Read uploads in 1 MB pieces instead of buffering the whole file in memory
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Built once at import so list requests reuse the compiled validator
+DOC_LIST_ADAPTER = TypeAdapter(list[DocumentResponse])
+
+# Load only the columns DocumentResponse needs; touching any other attribute raises
+# instead of lazy-loading (which would fail on an AsyncSession anyway)
+DOC_LIST_LOAD_OPTIONS = (
+    load_only(
+        *(getattr(Document, field) for field in DocumentResponse.model_fields),
+        raiseload=True,
+    ),
+)
+
+
+async def _save_upload_to_temp_file(file: UploadFile, max_size_mb: int) -> tuple[Path, int]:
+    """
+    Stream an uploaded file to a temporary file on disk.
+
+    Args:
+        file: Uploaded file
+        max_size_mb: Maximum allowed size in megabytes
+
+    Returns:
+        Tuple of (temporary file path, file size in bytes)
+
+    Raises:
+        FileSizeExceededError: If the upload exceeds the maximum size
+    """
+    file_size = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
+        temp_path = Path(temp_file.name)
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                validate_file_size(file_size, max_size_mb)
+                temp_file.write(chunk)
+        except Exception:
+            temp_file.close()
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    return temp_path, file_size
+
+
+def _extract_and_chunk(
+    pdf_service: PDFService, chunking_service: ChunkingService, pdf_path: Path
+) -> tuple[int, list[dict]]:
+    """
+    Stream PDF pages straight into the chunker.
+
+    Only one page's text is held at a time instead of the whole document.
+
+    Args:
+        pdf_service: PDF service yielding pages
+        chunking_service: Chunking service consuming them
+        pdf_path: Path to the PDF file
+
+    Returns:
+        Tuple of (number of pages, chunk dictionaries)
+    """
+    total_pages = 0
+
+    def pages():
+        nonlocal total_pages
+        for page_num, text in pdf_service.iter_pages(str(pdf_path)):
+            total_pages = page_num
+            yield page_num, text
+
+    chunks_data = chunking_service.chunk_text(pages())
+    return total_pages, chunks_data
+
 
 @router.post(
     "/upload",
@@ -49,6 +128,7 @@ router = APIRouter(prefix="/documents", tags=["documents"])
     status_code=status.HTTP_201_CREATED,
     summary="Subir documento PDF",
     description="Sube un PDF y comienza el procesamiento asíncrono",
+    dependencies=[Depends(upload_slot)],
 )
 async def upload_document(
     file: Annotated[UploadFile, File(description="Archivo PDF a procesar")],
@@ -58,6 +138,8 @@ async def upload_document(
     pdf_service: Annotated[PDFService, Depends(get_pdf_service)],
     chunking_service: Annotated[ChunkingService, Depends(get_chunking_service)],
     embedding_service: Annotated[EmbeddingService, Depends(get_embedding_service)],
+    semantic_cache: Annotated[SemanticCache, Depends(get_semantic_cache)],
+    settings: Annotated[Settings, Depends(get_settings)],
 ):
     """
     Upload and process a PDF document.
@@ -75,10 +157,8 @@ async def upload_document(
         # Validate file
         validate_file_type(file.filename)
 
-        # Read file content
-        content = await file.read()
-        file_size = len(content)
-        validate_file_size(file_size)
+        # Stream upload to a temporary file, enforcing the size limit as we go
+        temp_path, file_size = await _save_upload_to_temp_file(file, settings.max_file_size_mb)
 
         # Create document record
         document = Document(
@@ -89,33 +169,27 @@ async def upload_document(
         document = await document_repo.create(document)
 
         try:
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-                temp_file.write(content)
-                temp_path = Path(temp_file.name)
-
-            # Extract text with page numbers
-            pages_text = pdf_service.extract_text_with_pages(str(temp_path))
-            logger.info(f"Extracted {len(pages_text)} pages from {file.filename}")
-
-            # Clean up temp file
-            temp_path.unlink()
+            # Extract and chunk page by page (blocking, run off the event loop)
+            total_pages, chunks_data = await run_in_threadpool(
+                _extract_and_chunk, pdf_service, chunking_service, temp_path
+            )
+            logger.info(
+                "Generated %d chunks from %d pages of %s",
+                len(chunks_data),
+                total_pages,
+                file.filename,
+            )
 
             # Update total pages
-            document.total_pages = len(pages_text)
-
-            # Chunk text
-            chunks_data = chunking_service.chunk_text(pages_text)
-            logger.info(f"Generated {len(chunks_data)} chunks from {file.filename}")
+            document.total_pages = total_pages
 
             # Generate embeddings and create chunk records
             chunk_texts = [chunk_data["content"] for chunk_data in chunks_data]
-            embeddings = embedding_service.embed_batch(chunk_texts)
+            embeddings = await embedding_service.embed_batch(chunk_texts)
 
-            # Create chunk objects
-            chunks = []
-            for chunk_data, embedding in zip(chunks_data, embeddings):
-                chunk = Chunk(
+            # Create chunk objects and insert them in one batch
+            chunks = [
+                Chunk(
                     document_id=document.id,
                     content=chunk_data["content"],
                     embedding=embedding,
@@ -123,14 +197,22 @@ async def upload_document(
                     chunk_index=chunk_data["chunk_index"],
                     word_count=chunk_data["word_count"],
                 )
-                chunk = await vector_repo.create_chunk(chunk)
-                chunks.append(chunk)
+                for chunk_data, embedding in zip(chunks_data, embeddings)
+            ]
+            await vector_repo.create_chunks_bulk(chunks, commit=False)
 
-            # Update document status
+            # Update document status (commits chunks in the same transaction)
             document.total_chunks = len(chunks)
             document.status = DocumentStatus.ready
             document = await document_repo.update(document)
 
+            # Unfiltered searches may now match the new document
+            semantic_cache.invalidate(document.id)
+
+            # Large loads shift chunk counts enough to mislead the planner
+            if len(chunks) > COPY_THRESHOLD:
+                await vector_repo.analyze_chunks()
+
             return DocumentResponse.model_validate(document)
 
         except (PDFProcessingError, Exception) as e:
@@ -144,6 +226,9 @@ async def upload_document(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail=f"Error procesando documento: {str(e)}",
             )
+        finally:
+            # Clean up temp file
+            temp_path.unlink(missing_ok=True)
 
     except InvalidFileTypeError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -198,11 +283,12 @@ async def list_documents(
     limit: int = 100,
 ):
     """List all uploaded documents."""
-    documents = await document_repo.list_all(limit=limit)
-    return DocumentListResponse(
-        documents=[DocumentResponse.model_validate(doc) for doc in documents],
-        total=len(documents),
-    )
+    documents = await document_repo.list_all(limit, *DOC_LIST_LOAD_OPTIONS)
+    items = DOC_LIST_ADAPTER.validate_python(documents, from_attributes=True)
+    payload = DocumentListResponse.model_construct(documents=items, total=len(items))
+
+    # Return the response directly so FastAPI does not re-validate the list
+    return ORJSONResponse(content=payload.model_dump())
 
 
 @router.delete(
@@ -214,22 +300,21 @@ async def list_documents(
 async def delete_document(
     document_id: UUID,
     document_repo: Annotated[DocumentRepository, Depends(get_document_repo)],
-    vector_repo: Annotated[VectorRepository, Depends(get_vector_repo)],
-    query_log_repo: Annotated[QueryLogRepository, Depends(get_query_log_repo)],
+    semantic_cache: Annotated[SemanticCache, Depends(get_semantic_cache)],
 ):
-    """Delete a document and all its chunks and query logs."""
-    document = await document_repo.get_by_id(document_id)
-    if not document:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Documento no encontrado")
-
+    """Delete a document; chunks and query logs go with it via ON DELETE CASCADE."""
     session = document_repo.session
 
     try:
-        # Delete dependents and document in a single transaction boundary.
-        await query_log_repo.delete_by_document_id(document_id, commit=False)
-        await vector_repo.delete_chunks_by_document_id(document_id, commit=False)
-        await document_repo.delete(document, commit=False)
+        deleted = await document_repo.delete_by_id(document_id, commit=False)
+        if not deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Documento no encontrado"
+            )
         await session.commit()
+        semantic_cache.invalidate(document_id)
+    except HTTPException:
+        raise
     except Exception:
         await session.rollback()
         logger.exception("Failed to delete document %s", document_id)
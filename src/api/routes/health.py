@@ -1,18 +1,27 @@
 """Health check endpoints."""
 
 from datetime import datetime
-from typing import Annotated
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, status
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.dependencies import get_db_session
+from src.api.dependencies import get_engine
 from src.api.schemas import HealthCheckResponse
 
 router = APIRouter(tags=["health"])
 
 
+@router.get(
+    "/livez",
+    status_code=status.HTTP_200_OK,
+    summary="Liveness check",
+    description="Indica que el proceso responde, sin consultar la base de datos",
+)
+async def liveness_check():
+    """Liveness endpoint with no dependencies."""
+    return {"status": "alive"}
+
+
 @router.get(
     "/health",
     response_model=HealthCheckResponse,
@@ -20,19 +29,21 @@ router = APIRouter(tags=["health"])
     summary="Health check",
     description="Verifica el estado del servicio y la base de datos",
 )
-async def health_check(
-    session: Annotated[AsyncSession, Depends(get_db_session)],
-):
+async def health_check():
     """
-    Health check endpoint.
+    Health check endpoint (readiness).
 
     Verifies:
     - Service is running
     - Database connection is working
+
+    Pings the database on a bare pooled connection instead of a full
+    session, so there is no transaction or commit per probe.
     """
     # Check database connection
     try:
-        await session.execute(text("SELECT 1"))
+        async with get_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
         db_status = "healthy"
     except Exception as e:
         db_status = f"unhealthy: {str(e)}"
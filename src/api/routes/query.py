@@ -3,8 +3,9 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 
-from src.api.dependencies import get_rag_service
+from src.api.dependencies import get_rag_service, query_slot
 from src.api.schemas import QueryRequest, QueryResponse
 from src.services.rag_service import RAGService
 from src.utils.exceptions import RAGSystemError
@@ -17,6 +18,7 @@ router = APIRouter(prefix="/query", tags=["query"])
     response_model=QueryResponse,
     summary="Hacer pregunta sobre documentos",
     description="Realiza una pregunta y obtiene respuesta usando RAG",
+    dependencies=[Depends(query_slot)],
 )
 async def query_documents(
     request: QueryRequest,
@@ -53,3 +55,38 @@ async def query_documents(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error procesando consulta: {str(e)}",
         )
+
+
+@router.post(
+    "/stream",
+    response_class=StreamingResponse,
+    summary="Hacer pregunta con respuesta en streaming",
+    description="Realiza una pregunta y recibe la respuesta a medida que se genera",
+    dependencies=[Depends(query_slot)],
+)
+async def stream_query(
+    request: QueryRequest,
+    rag_service: Annotated[RAGService, Depends(get_rag_service)],
+):
+    """
+    Query documents using RAG, streaming the answer as plain text.
+
+    The first tokens reach the client as soon as the LLM produces them instead
+    of after the whole answer has been generated. Validation, retrieval and the
+    start of generation finish before the response starts, so their errors are
+    returned with the same status codes as /query.
+    """
+    try:
+        deltas = await rag_service.stream_answer(
+            question=request.question,
+            document_id=request.document_id,
+        )
+    except RAGSystemError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error procesando consulta: {str(e)}",
+        )
+
+    return StreamingResponse(deltas, media_type="text/plain; charset=utf-8")
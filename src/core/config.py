@@ -1,6 +1,7 @@
 """Application configuration using pydantic-settings."""
 
 from functools import lru_cache
+from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,13 +11,19 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str
+    db_pool_size: int = 20
+    db_max_overflow: int = 30
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
 
     # OpenRouter API
     openrouter_api_key: str
     openrouter_base_url: str = "https://openrouter.ai/api/v1"
+    openai_max_retries: int = 5
 
     # Models
     embedding_model: str = "text-embedding-3-small"
+    embedding_cache_size: int = 10_000
     llm_model: str = "~openai/gpt-latest"
 
     # Chunking
@@ -26,10 +33,21 @@ class Settings(BaseSettings):
     # Retrieval
     top_k_results: int = 5
     min_similarity_threshold: float = 0.3
+    hnsw_ef_search: Optional[int] = None  # None = tuned from the chunk count
+    # Semantic cache of retrieval results and answers. It lives in each worker
+    # process: an upload or delete invalidates it only in the worker that handled
+    # it, so other workers may serve stale entries until semantic_cache_ttl_seconds
+    semantic_cache_threshold: float = 0.97
+    semantic_cache_size: int = 1024
+    semantic_cache_ttl_seconds: int = 300
 
     # File Upload
     max_file_size_mb: int = 50
 
+    # Concurrency (uploads stay below db_pool_size so they cannot drain the pool)
+    max_concurrent_uploads: int = 8
+    max_concurrent_queries: int = 64
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
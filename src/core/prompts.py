@@ -17,6 +17,9 @@ CONTEXTO DEL DOCUMENTO:
 
 Responde la siguiente pregunta basándote ÚNICAMENTE en el contexto anterior."""
 
+# Template split once at import so each query is a plain concatenation
+_PROMPT_PREFIX, _PROMPT_SUFFIX = SYSTEM_PROMPT_TEMPLATE.split("{context}")
+
 
 def format_prompt(context: str, question: str) -> str:
     """
@@ -29,9 +32,7 @@ def format_prompt(context: str, question: str) -> str:
     Returns:
         Formatted prompt ready for LLM
     """
-    system_prompt = SYSTEM_PROMPT_TEMPLATE.format(context=context)
-    full_prompt = f"{system_prompt}\n\nPREGUNTA: {question}\n\nRESPUESTA:"
-    return full_prompt
+    return f"{_PROMPT_PREFIX}{context}{_PROMPT_SUFFIX}\n\nPREGUNTA: {question}\n\nRESPUESTA:"
 
 
 def format_context_from_chunks(chunks_with_scores: list[tuple]) -> str:
@@ -47,13 +48,12 @@ def format_context_from_chunks(chunks_with_scores: list[tuple]) -> str:
     if not chunks_with_scores:
         return "No se encontró información relevante en el documento."
 
-    context_parts = []
-    for i, (chunk, score) in enumerate(chunks_with_scores, 1):
-        page_num = chunk.page_number
-        content = chunk.content
-        context_parts.append(f"[Fragmento {i} - Página {page_num}]\n{content}")
-
-    return "\n\n".join(context_parts)
+    return "\n\n".join(
+        [
+            f"[Fragmento {i} - Página {chunk.page_number}]\n{chunk.content}"
+            for i, (chunk, _) in enumerate(chunks_with_scores, 1)
+        ]
+    )
 
 
 # Out-of-scope refusal message
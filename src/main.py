@@ -1,9 +1,19 @@
 """FastAPI application main entry point."""
 
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
+from src.api.dependencies import (
+    build_chunking_service,
+    build_embedding_service,
+    build_llm_service,
+    build_openai_client,
+    build_pdf_service,
+    build_semantic_cache,
+)
 from src.api.middleware import (
     add_cors_middleware,
     add_error_handler_middleware,
@@ -17,6 +27,25 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build long-lived services once at startup and share them across requests."""
+    app.state.openai_client = build_openai_client()
+    app.state.pdf_service = build_pdf_service()
+    app.state.chunking_service = build_chunking_service()
+    app.state.embedding_service = build_embedding_service()
+    app.state.llm_service = build_llm_service()
+    app.state.semantic_cache = build_semantic_cache()
+    yield
+    app.state.pdf_service.close()
+    await app.state.openai_client.close()
+    # Drop the closed client so a restarted app builds a fresh one
+    build_openai_client.cache_clear()
+    build_embedding_service.cache_clear()
+    build_llm_service.cache_clear()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Sistema RAG en Español",
@@ -42,6 +71,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Add middleware (order matters - last added runs first)
@@ -0,0 +1,60 @@
+"""Maintenance commands run outside the API process.
+
+Usage:
+    python -m src.maintenance [--force]
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Optional
+
+from src.api.dependencies import get_engine, get_session_factory
+from src.repositories.vector_index_config import HNSWParams
+from src.repositories.vector_repo import VectorRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_vector_index(force: bool = False) -> Optional[HNSWParams]:
+    """
+    Rebuild the HNSW index when the chunk count has crossed a size tier.
+
+    Args:
+        force: Rebuild even if the index already matches the current tier
+
+    Returns:
+        HNSWParams used for the new index, or None if no rebuild was needed
+    """
+    async with get_session_factory()() as session:
+        repo = VectorRepository(session)
+        if not force and not await repo.index_needs_rebuild():
+            logger.info("HNSW index already matches the current chunk count")
+            return None
+        return await repo.rebuild_index()
+
+
+async def _main(force: bool) -> None:
+    """Run the rebuild and release pooled connections."""
+    try:
+        await rebuild_vector_index(force=force)
+    finally:
+        await get_engine().dispose()
+
+
+def main() -> None:
+    """Parse command-line arguments and run the index maintenance."""
+    parser = argparse.ArgumentParser(description="Reconstruye el índice HNSW si es necesario")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reconstruir aunque el índice ya corresponda al tamaño actual",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(message)s")
+    asyncio.run(_main(args.force))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,9 @@ class QueryLog(Base):
     __tablename__ = "query_logs"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False)
+    document_id = Column(
+        UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+    )
     query_text = Column(Text, nullable=False)
     answer_text = Column(Text, nullable=False)
     retrieved_chunks = Column(JSON, nullable=True)
@@ -3,8 +3,9 @@
 from typing import Generic, Optional, Type, TypeVar
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
 # Type variable for SQLAlchemy models
 ModelType = TypeVar("ModelType")
@@ -24,17 +25,20 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
         self.session = session
 
-    async def get_by_id(self, id: UUID) -> Optional[ModelType]:
+    async def get_by_id(self, id: UUID, *options: ORMOption) -> Optional[ModelType]:
         """
         Get entity by ID.
 
         Args:
             id: Entity UUID
+            *options: Loader options (e.g. load_only, selectinload) for the query
 
         Returns:
             Entity instance or None if not found
         """
-        result = await self.session.execute(select(self.model).where(self.model.id == id))
+        result = await self.session.execute(
+            select(self.model).where(self.model.id == id).options(*options)
+        )
         return result.scalar_one_or_none()
 
     async def create(self, entity: ModelType) -> ModelType:
@@ -49,7 +53,7 @@ class BaseRepository(Generic[ModelType]):
         """
         self.session.add(entity)
         await self.session.commit()
-        await self.session.refresh(entity)
+        await self._refresh_if_expired(entity)
         return entity
 
     async def update(self, entity: ModelType) -> ModelType:
@@ -63,9 +67,22 @@ class BaseRepository(Generic[ModelType]):
             Updated entity
         """
         await self.session.commit()
-        await self.session.refresh(entity)
+        await self._refresh_if_expired(entity)
         return entity
 
+    async def _refresh_if_expired(self, entity: ModelType) -> None:
+        """
+        Reload an entity only if the flush left server-generated columns expired.
+
+        Client-side defaults (UUID ids, timestamps) are already populated on the
+        instance after flush, so the SELECT round-trip is skipped for them.
+
+        Args:
+            entity: Committed entity
+        """
+        if inspect(entity).expired_attributes:
+            await self.session.refresh(entity)
+
     async def delete(self, entity: ModelType, commit: bool = True) -> None:
         """
         Delete entity.
@@ -78,15 +95,16 @@ class BaseRepository(Generic[ModelType]):
         if commit:
             await self.session.commit()
 
-    async def list_all(self, limit: int = 100) -> list[ModelType]:
+    async def list_all(self, limit: int = 100, *options: ORMOption) -> list[ModelType]:
         """
         List all entities.
 
         Args:
             limit: Maximum number of entities to return
+            *options: Loader options (e.g. load_only, selectinload) for the query
 
         Returns:
             List of entities
         """
-        result = await self.session.execute(select(self.model).limit(limit))
+        result = await self.session.execute(select(self.model).options(*options).limit(limit))
         return list(result.scalars().all())
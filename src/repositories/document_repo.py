@@ -3,7 +3,7 @@
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.document import Document, DocumentStatus
@@ -30,11 +30,32 @@ class DocumentRepository(BaseRepository[Document]):
         result = await self.session.execute(select(Document).where(Document.filename == filename))
         return result.scalar_one_or_none()
 
+    async def delete_by_id(self, document_id: UUID, commit: bool = True) -> bool:
+        """
+        Delete a document in a single statement.
+
+        Chunks and query logs are removed by the ON DELETE CASCADE foreign keys.
+
+        Args:
+            document_id: Document UUID
+            commit: Whether to commit immediately
+
+        Returns:
+            True if a document was deleted, False if it did not exist
+        """
+        result = await self.session.execute(
+            delete(Document).where(Document.id == document_id).returning(Document.id)
+        )
+        deleted = result.first() is not None
+        if commit:
+            await self.session.commit()
+        return deleted
+
     async def update_status(
         self, document_id: UUID, status: DocumentStatus, error_message: Optional[str] = None
-    ) -> Document:
+    ) -> Optional[Document]:
         """
-        Update document status.
+        Update document status in a single UPDATE ... RETURNING statement.
 
         Args:
             document_id: Document UUID
@@ -42,12 +63,15 @@ class DocumentRepository(BaseRepository[Document]):
             error_message: Error message if status is failed
 
         Returns:
-            Updated document
+            Updated document or None if it does not exist
         """
-        document = await self.get_by_id(document_id)
-        if document:
-            document.status = status
-            if error_message:
-                document.error_message = error_message
-            return await self.update(document)
-        return None
+        values = {"status": status}
+        if error_message:
+            values["error_message"] = error_message
+
+        result = await self.session.execute(
+            update(Document).where(Document.id == document_id).values(**values).returning(Document)
+        )
+        document = result.scalar_one_or_none()
+        await self.session.commit()
+        return document
@@ -0,0 +1,38 @@
+"""HNSW index parameters tuned to the size of the chunks table."""
+
+from typing import NamedTuple
+
+
+class HNSWParams(NamedTuple):
+    """Build and query parameters for the pgvector HNSW index."""
+
+    m: int
+    ef_construction: int
+    ef_search: int
+
+
+# (exclusive upper bound on vector count, parameters); None means no upper bound
+HNSW_TIERS: tuple[tuple[int | None, HNSWParams], ...] = (
+    (100_000, HNSWParams(m=16, ef_construction=64, ef_search=40)),
+    (1_000_000, HNSWParams(m=24, ef_construction=128, ef_search=100)),
+    (None, HNSWParams(m=32, ef_construction=200, ef_search=200)),
+)
+
+
+def configure_hnsw_params(vector_count: int) -> HNSWParams:
+    """
+    Pick HNSW parameters for the given number of indexed vectors.
+
+    Small corpora keep pgvector's defaults; larger ones trade build time and
+    memory for a denser graph and a wider search to hold recall.
+
+    Args:
+        vector_count: Number of rows in the chunks table
+
+    Returns:
+        HNSWParams for the matching size tier
+    """
+    for upper_bound, params in HNSW_TIERS:
+        if upper_bound is None or vector_count < upper_bound:
+            return params
+    return HNSW_TIERS[-1][1]
@@ -1,27 +1,73 @@
 """Vector repository for similarity search operations."""
 
 import logging
-import os
+import struct
+from datetime import datetime
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
-import psycopg2
-from pgvector.psycopg2 import register_vector
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, insert, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from src.models.chunk import Chunk
 from src.repositories.base import BaseRepository
+from src.repositories.vector_index_config import HNSWParams, configure_hnsw_params
 
 logger = logging.getLogger(__name__)
 
+# HNSW parameters tuned to the chunk count, computed once per process
+_tuned_hnsw_params: Optional[HNSWParams] = None
+
+# Batches larger than this are written with binary COPY instead of INSERT
+COPY_THRESHOLD = 100
+
+COPY_COLUMNS = (
+    "id",
+    "document_id",
+    "content",
+    "embedding",
+    "page_number",
+    "chunk_index",
+    "word_count",
+    "created_at",
+)
+
+# Statements built once; asyncpg caches the prepared form per connection
+_SET_EF_SEARCH = text("SELECT set_config('hnsw.ef_search', :ef_search, true)")
+_ANALYZE_CHUNKS = text("ANALYZE chunks")
+_SET_ENABLE_SEQSCAN = text("SELECT set_config('enable_seqscan', :value, true)")
+_GET_INDEX_OPTIONS = text("SELECT reloptions FROM pg_class WHERE relname = 'ix_chunks_embedding'")
+
+# Build options pgvector uses when the index was created without a WITH clause
+_PGVECTOR_HNSW_DEFAULTS = {"m": "16", "ef_construction": "64"}
+
+
+def _encode_halfvec(value: List[float]) -> bytes:
+    """Encode a halfvec in pgvector's binary wire format (dim, unused, float2 values)."""
+    return struct.pack(f">HH{len(value)}e", len(value), 0, *value)
+
+
+def _decode_halfvec(data: bytes) -> List[float]:
+    """Decode a halfvec from pgvector's binary wire format."""
+    dim = struct.unpack_from(">H", data)[0]
+    return list(struct.unpack_from(f">{dim}e", data, 4))
+
 
 class VectorRepository(BaseRepository[Chunk]):
     """Repository for vector operations and similarity search."""
 
-    def __init__(self, session: AsyncSession):
-        """Initialize vector repository."""
+    def __init__(self, session: AsyncSession, ef_search: Optional[int] = None):
+        """
+        Initialize vector repository.
+
+        Args:
+            session: Async database session
+            ef_search: HNSW candidate list size used by similarity_search;
+                tuned from the chunk count when None
+        """
         super().__init__(Chunk, session)
+        self.ef_search = ef_search
 
     async def create_chunk(self, chunk: Chunk) -> Chunk:
         """
@@ -35,6 +81,91 @@ class VectorRepository(BaseRepository[Chunk]):
         """
         return await self.create(chunk)
 
+    async def create_chunks_bulk(self, chunks: List[Chunk], commit: bool = True) -> List[Chunk]:
+        """
+        Create many chunks in a single batched write.
+
+        Small batches are sent as one Core INSERT with executemany parameters,
+        skipping the ORM unit of work. Larger batches are streamed with binary
+        COPY on the session's asyncpg connection so the embedding vectors are
+        not serialized as text.
+
+        Args:
+            chunks: Chunk instances to create
+            commit: Whether to commit immediately
+
+        Returns:
+            Created chunks
+        """
+        if chunks:
+            rows = self._chunk_rows(chunks)
+            if len(chunks) > COPY_THRESHOLD:
+                await self._copy_chunk_rows(rows)
+            else:
+                await self.session.execute(insert(Chunk), rows)
+        if commit:
+            await self.session.commit()
+        return chunks
+
+    @staticmethod
+    def _chunk_rows(chunks: List[Chunk]) -> List[dict]:
+        """
+        Build column values for chunks, filling in client-side defaults.
+
+        Defaults are applied here because neither path goes through the ORM,
+        and written back so callers see the stored id and created_at.
+
+        Args:
+            chunks: Chunk instances to write
+
+        Returns:
+            One dict per chunk keyed by COPY_COLUMNS
+        """
+        now = datetime.utcnow()
+        rows = []
+        for chunk in chunks:
+            chunk.id = chunk.id or uuid4()
+            chunk.created_at = chunk.created_at or now
+            rows.append({column: getattr(chunk, column) for column in COPY_COLUMNS})
+        return rows
+
+    async def _copy_chunk_rows(self, rows: List[dict]) -> None:
+        """
+        Write chunk rows with binary COPY inside the session's transaction.
+
+        Args:
+            rows: Column values from _chunk_rows
+        """
+        records = [tuple(row[column] for column in COPY_COLUMNS) for row in rows]
+
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        # Scope the binary codec to this COPY so pooled connections keep the default
+        await driver_connection.set_type_codec(
+            "halfvec",
+            encoder=_encode_halfvec,
+            decoder=_decode_halfvec,
+            format="binary",
+        )
+        try:
+            await driver_connection.copy_records_to_table(
+                Chunk.__tablename__, records=records, columns=COPY_COLUMNS
+            )
+        finally:
+            await driver_connection.reset_type_codec("halfvec")
+
+    async def analyze_chunks(self) -> None:
+        """
+        Refresh planner statistics for the chunks table.
+
+        Run after large loads so per-document filters are costed against the
+        real row counts when choosing between the B-tree and HNSW plans.
+        """
+        await self.session.execute(_ANALYZE_CHUNKS)
+        await self.session.commit()
+
     async def get_chunks_by_document_id(self, document_id: UUID) -> List[Chunk]:
         """
         Get all chunks for a document.
@@ -62,6 +193,66 @@ class VectorRepository(BaseRepository[Chunk]):
         if commit:
             await self.session.commit()
 
+    async def rebuild_index(self) -> HNSWParams:
+        """
+        Rebuild the HNSW index with parameters matching the current chunk count.
+
+        Run by the maintenance command (python -m src.maintenance) after the
+        corpus crosses a size tier.
+
+        Returns:
+            HNSWParams used for the new index
+        """
+        global _tuned_hnsw_params
+
+        result = await self.session.execute(select(func.count()).select_from(Chunk))
+        params = configure_hnsw_params(result.scalar_one())
+
+        await self.session.execute(text("DROP INDEX IF EXISTS ix_chunks_embedding"))
+        await self.session.execute(
+            text(
+                "CREATE INDEX ix_chunks_embedding ON chunks "
+                "USING hnsw (embedding halfvec_ip_ops) "
+                f"WITH (m = {params.m}, ef_construction = {params.ef_construction})"
+            )
+        )
+        await self.session.commit()
+
+        _tuned_hnsw_params = params
+        logger.info("Rebuilt HNSW index with %s", params)
+        return params
+
+    async def index_needs_rebuild(self) -> bool:
+        """
+        Check whether the HNSW index was built for a different size tier.
+
+        Compares the index's stored build options with the parameters the
+        current chunk count calls for.
+
+        Returns:
+            True if the index is missing or its m/ef_construction differ
+        """
+        result = await self.session.execute(select(func.count()).select_from(Chunk))
+        params = configure_hnsw_params(result.scalar_one())
+
+        row = (await self.session.execute(_GET_INDEX_OPTIONS)).first()
+        if row is None:
+            return True
+        options = dict(_PGVECTOR_HNSW_DEFAULTS)
+        options.update(option.split("=", 1) for option in row[0] or ())
+        return (int(options["m"]), int(options["ef_construction"])) != (
+            params.m,
+            params.ef_construction,
+        )
+
+    async def _get_tuned_hnsw_params(self) -> HNSWParams:
+        """Count chunks once per process and pick the matching HNSW parameters."""
+        global _tuned_hnsw_params
+        if _tuned_hnsw_params is None:
+            result = await self.session.execute(select(func.count()).select_from(Chunk))
+            _tuned_hnsw_params = configure_hnsw_params(result.scalar_one())
+        return _tuned_hnsw_params
+
     async def similarity_search(
         self,
         embedding: List[float],
@@ -70,10 +261,7 @@ class VectorRepository(BaseRepository[Chunk]):
         document_id: Optional[UUID] = None,
     ) -> List[tuple[Chunk, float]]:
         """
-        Perform similarity search using cosine distance with sync psycopg2.
-
-        Uses synchronous psycopg2 connection for vector search as it has
-        better pgvector compatibility than async drivers.
+        Perform similarity search using inner product on the async session.
 
         Args:
             embedding: Query embedding vector
@@ -85,95 +273,37 @@ class VectorRepository(BaseRepository[Chunk]):
             List of (chunk, similarity_score) tuples ordered by relevance
         """
         logger.info(
-            f"[SYNC] Vector search: doc_id={document_id}, min_score={min_score}, top_k={top_k}"
+            "Vector search: doc_id=%s, min_score=%s, top_k=%d", document_id, min_score, top_k
         )
 
-        # Get sync connection string from async one
-        database_url = os.getenv("DATABASE_URL", "")
-        # Convert asyncpg URL to psycopg2 URL
-        sync_url = database_url.replace("postgresql+asyncpg://", "postgresql://")
+        # Scoped to the current transaction; set_config accepts bind parameters
+        ef_search = self.ef_search or (await self._get_tuned_hnsw_params()).ef_search
+        await self.session.execute(_SET_EF_SEARCH, {"ef_search": str(ef_search)})
 
-        # Use sync psycopg2 for vector search
-        conn = None
-        try:
-            conn = psycopg2.connect(sync_url)
-            register_vector(conn)
-
-            cursor = conn.cursor()
-
-            # Convert embedding list to string format for pgvector
-            # pgvector expects format: '[0.1,0.2,0.3,...]'
-            embedding_str = "[" + ",".join(str(x) for x in embedding) + "]"
-
-            # Build query with optional document filter
-            if document_id is not None:
-                query = """
-                    SELECT
-                        id, document_id, content, page_number,
-                        chunk_index, word_count, created_at,
-                        1 - (embedding <=> %s::vector) AS similarity
-                    FROM chunks
-                    WHERE document_id = %s
-                      AND embedding IS NOT NULL
-                      AND 1 - (embedding <=> %s::vector) >= %s
-                    ORDER BY embedding <=> %s::vector
-                    LIMIT %s
-                """
-                params = (
-                    embedding_str,
-                    str(document_id),
-                    embedding_str,
-                    min_score,
-                    embedding_str,
-                    top_k,
-                )
-            else:
-                query = """
-                    SELECT
-                        id, document_id, content, page_number,
-                        chunk_index, word_count, created_at,
-                        1 - (embedding <=> %s::vector) AS similarity
-                    FROM chunks
-                    WHERE embedding IS NOT NULL
-                      AND 1 - (embedding <=> %s::vector) >= %s
-                    ORDER BY embedding <=> %s::vector
-                    LIMIT %s
-                """
-                params = (embedding_str, embedding_str, min_score, embedding_str, top_k)
-
-            logger.info(
-                f"[SYNC] Executing query: doc_id={document_id if document_id else 'all'}, "
-                f"min_score={min_score}, top_k={top_k}, embedding_len={len(embedding)}"
-            )
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-
-            logger.info(f"[SYNC] Vector search returned {len(rows)} rows")
-            if len(rows) > 0:
-                logger.info(f"[SYNC] Top result similarity: {float(rows[0][7])}")
-
-            # Convert rows to Chunk objects with scores
-            chunks_with_scores = []
-            for row in rows:
-                chunk = Chunk(
-                    id=row[0],
-                    document_id=row[1],
-                    content=row[2],
-                    page_number=row[3],
-                    chunk_index=row[4],
-                    word_count=row[5],
-                    created_at=row[6],
-                )
-                similarity = float(row[7])
-                chunks_with_scores.append((chunk, similarity))
-
-            cursor.close()
-            conn.close()
-
-            return chunks_with_scores
-
-        except Exception as e:
-            logger.error(f"[SYNC] Error in vector search: {e}")
-            if conn:
-                conn.close()
-            raise
+        # Embeddings are unit length, so cosine similarity is the inner product.
+        # pgvector's <#> returns the negated inner product (ascending = most similar).
+        negative_similarity = Chunk.embedding.max_inner_product(embedding)
+        query = (
+            select(Chunk, (-negative_similarity).label("similarity"))
+            .options(defer(Chunk.embedding))
+            .where(Chunk.embedding.is_not(None), negative_similarity <= -min_score)
+            .order_by(negative_similarity)
+            .limit(top_k)
+        )
+        if document_id is not None:
+            # Keep seq scans available so the planner can filter by document first
+            query = query.where(Chunk.document_id == document_id)
+            result = await self.session.execute(query)
+        else:
+            # Stale row estimates can make the planner pick a full scan + sort over
+            # the HNSW index; rule that out for the pure ANN query. The setting is
+            # transaction-local, so it is only restored for later statements when the
+            # search succeeds; a failed search aborts the transaction, which resets it
+            await self.session.execute(_SET_ENABLE_SEQSCAN, {"value": "off"})
+            result = await self.session.execute(query)
+            await self.session.execute(_SET_ENABLE_SEQSCAN, {"value": "on"})
+
+        chunks_with_scores = [(chunk, float(similarity)) for chunk, similarity in result.all()]
+
+        logger.info("Vector search returned %d rows", len(chunks_with_scores))
+        return chunks_with_scores
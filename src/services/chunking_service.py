@@ -1,11 +1,35 @@
 """Text chunking service for splitting documents into semantic chunks."""
 
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, Iterable, List, Union
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from src.utils.text_processing import clean_text
 
+# Tokenizer used by the OpenAI embedding models
+ENCODING_NAME = "cl100k_base"
+
+
+@lru_cache(maxsize=8)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """
+    Build a token-measured splitter once per size/overlap pair.
+
+    Args:
+        chunk_size: Maximum chunk size in tokens
+        chunk_overlap: Tokens shared between consecutive chunks
+
+    Returns:
+        RecursiveCharacterTextSplitter measuring length with tiktoken
+    """
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        encoding_name=ENCODING_NAME,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", ". ", " ", ""],
+    )
+
 
 class ChunkingService:
     """Service for splitting text into semantic chunks with overlap."""
@@ -22,13 +46,17 @@ class ChunkingService:
         self.chunk_overlap = chunk_overlap
 
     def chunk_text(
-        self, pages_dict: Dict[int, str], chunk_size: int = None, overlap: int = None
+        self,
+        pages: Union[Dict[int, str], Iterable[tuple[int, str]]],
+        chunk_size: int = None,
+        overlap: int = None,
     ) -> List[Dict]:
         """
         Split text into chunks preserving page numbers.
 
         Args:
-            pages_dict: Dictionary mapping page number to text
+            pages: Dictionary mapping page number to text, or an iterable of
+                (page number, text) pairs in page order, consumed one page at a time
             chunk_size: Override default chunk size
             overlap: Override default overlap
 
@@ -42,24 +70,16 @@ class ChunkingService:
         chunk_size = chunk_size or self.chunk_size
         overlap = overlap or self.chunk_overlap
 
-        # Create text splitter (using character-based approximation)
-        # Approximate 1 token ≈ 4 characters
-        char_chunk_size = chunk_size * 4
-        char_overlap = overlap * 4
-
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=char_chunk_size,
-            chunk_overlap=char_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        # Chunk sizes are measured in real tokens, matching the embedding model
+        splitter = _get_splitter(chunk_size, overlap)
 
         chunks = []
         chunk_index = 0
 
-        for page_num in sorted(pages_dict.keys()):
-            page_text = pages_dict[page_num]
+        if isinstance(pages, dict):
+            pages = sorted(pages.items())
 
+        for page_num, page_text in pages:
             if not page_text.strip():
                 continue
 
@@ -70,15 +90,18 @@ class ChunkingService:
             page_chunks = splitter.split_text(cleaned_text)
 
             for chunk_text in page_chunks:
-                if not chunk_text.strip():
+                content = chunk_text.strip()
+                if not content:
                     continue
 
                 chunks.append(
                     {
-                        "content": chunk_text.strip(),
+                        "content": content,
                         "page_number": page_num,
                         "chunk_index": chunk_index,
-                        "word_count": len(chunk_text.split()),
+                        # Cleaned text has single spaces, so counting them avoids
+                        # allocating a list of words per chunk
+                        "word_count": content.count(" ") + 1,
                     }
                 )
                 chunk_index += 1
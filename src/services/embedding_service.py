@@ -1,16 +1,49 @@
 """Embedding service for generating vector embeddings."""
 
-from typing import List
+import asyncio
+import hashlib
+from typing import List, Optional
 
-from openai import OpenAI
+import numpy as np
+from openai import AsyncOpenAI
 
+from src.utils.cache import LRUCache
 from src.utils.exceptions import EmbeddingServiceError
 
+# OpenAI models whose embeddings are already unit length
+UNIT_NORM_MODELS = frozenset(
+    {"text-embedding-3-small", "text-embedding-3-large", "text-embedding-ada-002"}
+)
+
+
+def normalize_embeddings(vectors: List[List[float]]) -> List[List[float]]:
+    """
+    Scale vectors to unit length so inner product equals cosine similarity.
+
+    Args:
+        vectors: Embedding vectors
+
+    Returns:
+        Unit-norm vectors (zero vectors are returned unchanged)
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).tolist()
+
 
 class EmbeddingService:
     """Service for generating text embeddings using OpenAI."""
 
-    def __init__(self, api_key: str, base_url: str, model: str = "text-embedding-3-small"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        model: str = "text-embedding-3-small",
+        max_concurrency: int = 8,
+        cache_size: int = 10_000,
+        client: Optional[AsyncOpenAI] = None,
+    ):
         """
         Initialize embedding service.
 
@@ -18,14 +51,34 @@ class EmbeddingService:
             api_key: OpenRouter API key
             base_url: OpenRouter base URL
             model: Embedding model to use
+            max_concurrency: Maximum number of batch requests in flight at once
+            cache_size: Maximum number of embeddings kept in the in-process cache
+            client: Shared AsyncOpenAI client; one is created from api_key/base_url if omitted
         """
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.client = client or AsyncOpenAI(api_key=api_key, base_url=base_url)
         self.model = model
-
-    def embed_text(self, text: str) -> List[float]:
+        self.max_concurrency = max_concurrency
+        # Inner-product search needs unit vectors; re-normalize other providers' output
+        self.normalize = model.rsplit("/", 1)[-1] not in UNIT_NORM_MODELS
+        self._cache: LRUCache[List[float]] = LRUCache(max_size=cache_size)
+        # Misses currently being fetched, so identical concurrent queries share one call
+        self._pending: dict[str, asyncio.Future] = {}
+
+    def _cache_key(self, text: str) -> str:
+        """Build a cache key from the model and the text content."""
+        return hashlib.sha256(f"{self.model}:{text}".encode("utf-8")).hexdigest()
+
+    def _postprocess(self, vectors: List[List[float]]) -> List[List[float]]:
+        """Normalize vectors when the model does not already return unit length."""
+        return normalize_embeddings(vectors) if self.normalize else vectors
+
+    async def embed_text(self, text: str) -> List[float]:
         """
         Generate embedding for a single text.
 
+        Surrounding whitespace is ignored, results are cached, and concurrent
+        calls for the same text wait on a single API request.
+
         Args:
             text: Text to embed
 
@@ -38,15 +91,49 @@ class EmbeddingService:
         if not text or not text.strip():
             raise EmbeddingServiceError("No se puede generar embedding de texto vacío")
 
+        text = text.strip()
+        key = self._cache_key(text)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
         try:
-            response = self.client.embeddings.create(input=text, model=self.model)
-            return response.data[0].embedding
+            response = await self.client.embeddings.create(input=text, model=self.model)
+            embedding = self._postprocess([response.data[0].embedding])[0]
         except Exception as e:
-            raise EmbeddingServiceError(f"Error al generar embedding: {str(e)}")
-
-    def embed_batch(self, texts: List[str], max_batch_size: int = 100) -> List[List[float]]:
+            error = EmbeddingServiceError(f"Error al generar embedding: {str(e)}")
+            future.set_exception(error)
+            # Mark the exception as retrieved in case no other caller was waiting
+            future.exception()
+            raise error
+        except BaseException:
+            # Only this caller was cancelled; waiters get an ordinary service error
+            # instead of a CancelledError their handlers would not catch
+            future.set_exception(
+                EmbeddingServiceError("La generación de embedding fue cancelada por otra solicitud")
+            )
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+
+        self._cache.set(key, embedding)
+        future.set_result(embedding)
+        return embedding
+
+    async def embed_batch(self, texts: List[str], max_batch_size: int = 100) -> List[List[float]]:
         """
-        Generate embeddings for multiple texts in batches.
+        Generate embeddings for multiple texts in concurrent batches.
+
+        Texts already in the cache are not re-sent. The remaining batches are
+        sent in parallel, with at most ``max_concurrency`` requests in flight,
+        and results are returned in input order.
 
         Args:
             texts: List of texts to embed
@@ -66,18 +153,45 @@ class EmbeddingService:
         if not non_empty_texts:
             raise EmbeddingServiceError("No hay textos válidos para generar embeddings")
 
-        embeddings = []
-
-        try:
-            # Process in batches
-            for i in range(0, len(non_empty_texts), max_batch_size):
-                batch = non_empty_texts[i : i + max_batch_size]
-                response = self.client.embeddings.create(input=batch, model=self.model)
-
-                # Extract embeddings in order
-                batch_embeddings = [item.embedding for item in response.data]
-                embeddings.extend(batch_embeddings)
-
-            return embeddings
-        except Exception as e:
-            raise EmbeddingServiceError(f"Error al generar embeddings en batch: {str(e)}")
+        # Only texts not seen before go to the API (duplicates are sent once)
+        keys = [self._cache_key(t) for t in non_empty_texts]
+        embeddings_by_key = {}
+        missing_texts = {}
+        for key, text in zip(keys, non_empty_texts):
+            cached = self._cache.get(key)
+            if cached is not None:
+                embeddings_by_key[key] = cached
+            else:
+                missing_texts.setdefault(key, text)
+
+        missing_keys = list(missing_texts)
+        missing = list(missing_texts.values())
+        batch_starts = range(0, len(missing), max_batch_size)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def embed_one_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                response = await self.client.embeddings.create(input=batch, model=self.model)
+            # Extract embeddings in order
+            return self._postprocess([item.embedding for item in response.data])
+
+        # Failed batches do not discard the ones that succeeded: those are
+        # cached so a retry only re-sends what is still missing
+        batch_results = await asyncio.gather(
+            *(embed_one_batch(missing[i : i + max_batch_size]) for i in batch_starts),
+            return_exceptions=True,
+        )
+
+        first_error = None
+        for start, batch_result in zip(batch_starts, batch_results):
+            if isinstance(batch_result, BaseException):
+                first_error = first_error or batch_result
+                continue
+            for key, embedding in zip(missing_keys[start : start + max_batch_size], batch_result):
+                embeddings_by_key[key] = embedding
+                self._cache.set(key, embedding)
+
+        if first_error is not None:
+            raise EmbeddingServiceError(f"Error al generar embeddings en batch: {str(first_error)}")
+
+        return [embeddings_by_key[key] for key in keys]
@@ -1,6 +1,9 @@
 """LLM service for generating responses using OpenAI."""
 
-from openai import OpenAI
+import asyncio
+from typing import AsyncIterator, Callable, Optional
+
+from openai import AsyncOpenAI
 
 from src.utils.exceptions import LLMServiceError
 
@@ -10,11 +13,13 @@ class LLMService:
 
     def __init__(
         self,
-        api_key: str,
-        base_url: str,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
         model: str = "~openai/gpt-latest",
         temperature: float = 0.1,
         max_tokens: int = 1000,
+        max_retries: int = 2,
+        client: Optional[AsyncOpenAI] = None,
     ):
         """
         Initialize LLM service.
@@ -25,16 +30,25 @@ class LLMService:
             model: Model to use for completions
             temperature: Temperature for generation (lower = more deterministic)
             max_tokens: Maximum tokens in response
+            max_retries: Retries with jittered backoff for rate limits and transient errors
+            client: Shared AsyncOpenAI client; one is created from api_key/base_url if omitted
         """
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.client = client or AsyncOpenAI(
+            api_key=api_key, base_url=base_url, max_retries=max_retries
+        )
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        # Completions in flight by prompt, so identical concurrent questions share one call
+        self._pending: dict[str, asyncio.Future] = {}
 
-    def generate_answer(self, prompt: str) -> tuple[str, int]:
+    async def generate_answer(self, prompt: str) -> tuple[str, int]:
         """
         Generate answer from prompt.
 
+        Concurrent calls with the same prompt (same question over the same
+        retrieved context) wait on a single API request.
+
         Args:
             prompt: Complete prompt including system instructions and question
 
@@ -47,18 +61,79 @@ class LLMService:
         if not prompt or not prompt.strip():
             raise LLMServiceError("No se puede generar respuesta con prompt vacío")
 
+        pending = self._pending.get(prompt)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[prompt] = future
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
             )
+            result = (response.choices[0].message.content, response.usage.total_tokens)
+        except Exception as e:
+            error = LLMServiceError(f"Error al generar respuesta del LLM: {str(e)}")
+            future.set_exception(error)
+            # Mark the exception as retrieved in case no other caller was waiting
+            future.exception()
+            raise error
+        except BaseException:
+            # Only this caller was cancelled; waiters get an ordinary service error
+            # instead of a CancelledError their handlers would not catch
+            future.set_exception(
+                LLMServiceError("La generación de respuesta fue cancelada por otra solicitud")
+            )
+            future.exception()
+            raise
+        finally:
+            del self._pending[prompt]
+
+        future.set_result(result)
+        return result
+
+    async def stream_answer(
+        self,
+        prompt: str,
+        on_usage: Optional[Callable[[int], None]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream the answer for a prompt as it is generated.
+
+        Args:
+            prompt: Complete prompt including system instructions and question
+            on_usage: Called with the total tokens used once the final chunk arrives
+
+        Yields:
+            Text deltas in generation order
 
-            answer_text = response.choices[0].message.content
-            tokens_used = response.usage.total_tokens
+        Raises:
+            LLMServiceError: If generation fails
+        """
+        if not prompt or not prompt.strip():
+            raise LLMServiceError("No se puede generar respuesta con prompt vacío")
+
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
 
-            return answer_text, tokens_used
+            async for chunk in stream:
+                # The usage-only final chunk carries no choices
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+                if chunk.usage and on_usage:
+                    on_usage(chunk.usage.total_tokens)
 
         except Exception as e:
             raise LLMServiceError(f"Error al generar respuesta del LLM: {str(e)}")
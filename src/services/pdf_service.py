@@ -1,16 +1,90 @@
 """PDF text extraction service."""
 
-from typing import Dict
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, Optional
 
 import pdfplumber
 import PyPDF2
+import pypdfium2 as pdfium
 
 from src.utils.exceptions import PDFProcessingError
 
+# Below this many pages, process start-up costs more than parallel extraction saves
+MIN_PAGES_FOR_PARALLEL = 4
+
+# PDFium is not thread-safe and uploads extract in threadpool threads, so every
+# call into pypdfium2 (open, page count, page text, close) holds this lock
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _extract_page_range(file_path: str, start: int, end: int) -> Dict[int, str]:
+    """
+    Extract text from a contiguous range of pages with pdfplumber.
+
+    Runs in a worker process, so it opens the PDF itself and only parses the
+    requested pages.
+
+    Args:
+        file_path: Path to the PDF file
+        start: First page number (1-indexed, inclusive)
+        end: Last page number (inclusive)
+
+    Returns:
+        Dictionary mapping page number to extracted text
+    """
+    pages_text = {}
+    with pdfplumber.open(file_path, pages=list(range(start, end + 1))) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text()
+            pages_text[page.page_number] = text.strip() if text else ""
+            # Release parsed layout objects before moving on
+            page.flush_cache()
+    return pages_text
+
 
 class PDFService:
     """Service for extracting text from PDF files."""
 
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize PDF service.
+
+        Args:
+            max_workers: Worker processes for page extraction (default: CPU count)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Uploads extract from threadpool threads; only one may start the pool
+        self._executor_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Shut down the extraction worker processes, if started."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Get or start the pool of extraction worker processes.
+
+        Workers are spawned rather than forked: forking a multithreaded server
+        process can copy locks held by other threads into the child.
+
+        Returns:
+            ProcessPoolExecutor shared by all extractions
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
     def extract_text_with_pages(self, file_path: str) -> Dict[int, str]:
         """
         Extract text from PDF with page numbers.
@@ -21,37 +95,146 @@ class PDFService:
         Returns:
             Dictionary mapping page number (1-indexed) to extracted text
 
+        Raises:
+            PDFProcessingError: If PDF extraction fails
+        """
+        # pypdfium2 is the fastest; pdfplumber and PyPDF2 cover files it rejects
+        try:
+            return self._extract_with_pdfium(file_path)
+        except Exception as e:
+            return self._extract_with_fallbacks(file_path, [f"pypdfium2: {str(e)}"])
+
+    def iter_pages(self, file_path: str) -> Iterator[tuple[int, str]]:
+        """
+        Yield (page number, text) pairs one page at a time.
+
+        Pages are read with pypdfium2 and released as soon as their text is
+        taken, so streaming consumers hold one page in memory. Files pypdfium2
+        cannot open fall back to the whole-document extractors.
+
+        Args:
+            file_path: Path to the PDF file
+
+        Yields:
+            Tuples of (page number, extracted text), 1-indexed and in order
+
         Raises:
             PDFProcessingError: If PDF extraction fails
         """
         try:
-            # Try pdfplumber first (better text extraction)
-            return self._extract_with_pdfplumber(file_path)
+            with _PDFIUM_LOCK:
+                pdf = pdfium.PdfDocument(file_path)
         except Exception as e:
-            # Fallback to PyPDF2
+            yield from self._extract_with_fallbacks(file_path, [f"pypdfium2: {str(e)}"]).items()
+            return
+
+        # The lock is taken per call, never held across a yield
+        try:
+            with _PDFIUM_LOCK:
+                page_count = len(pdf)
+            if page_count == 0:
+                raise PDFProcessingError("El PDF está vacío (0 páginas)")
+            for page_num in range(1, page_count + 1):
+                try:
+                    text = self._pdfium_page_text(pdf, page_num - 1)
+                except Exception as e:
+                    raise PDFProcessingError(
+                        f"No se pudo procesar la página {page_num} del PDF: {str(e)}"
+                    )
+                yield page_num, text
+        finally:
+            with _PDFIUM_LOCK:
+                pdf.close()
+
+    def _extract_with_fallbacks(self, file_path: str, errors: list[str]) -> Dict[int, str]:
+        """
+        Extract text with pdfplumber, then PyPDF2.
+
+        Args:
+            file_path: Path to the PDF file
+            errors: Failures of the extractors already tried
+
+        Returns:
+            Dictionary mapping page number (1-indexed) to extracted text
+
+        Raises:
+            PDFProcessingError: If every extractor fails
+        """
+        for name, extract in (
+            ("pdfplumber", self._extract_with_pdfplumber),
+            ("PyPDF2", self._extract_with_pypdf2),
+        ):
             try:
-                return self._extract_with_pypdf2(file_path)
-            except Exception as fallback_error:
-                raise PDFProcessingError(
-                    f"No se pudo procesar el archivo PDF. "
-                    f"Error principal: {str(e)}. "
-                    f"Error alternativo: {str(fallback_error)}"
-                )
+                return extract(file_path)
+            except Exception as e:
+                errors.append(f"{name}: {str(e)}")
+
+        raise PDFProcessingError(
+            f"No se pudo procesar el archivo PDF. Errores: {'; '.join(errors)}"
+        )
+
+    @staticmethod
+    def _pdfium_page_text(pdf: pdfium.PdfDocument, index: int) -> str:
+        """Extract one page's text and release its PDFium handles right away."""
+        with _PDFIUM_LOCK:
+            page = pdf[index]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
+        return text.replace("\r\n", "\n").strip()
+
+    def _extract_with_pdfium(self, file_path: str) -> Dict[int, str]:
+        """Extract text using pypdfium2's range-based text extraction."""
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(file_path)
+        try:
+            with _PDFIUM_LOCK:
+                page_count = len(pdf)
+            if page_count == 0:
+                raise PDFProcessingError("El PDF está vacío (0 páginas)")
+            return {
+                page_num: self._pdfium_page_text(pdf, page_num - 1)
+                for page_num in range(1, page_count + 1)
+            }
+        finally:
+            with _PDFIUM_LOCK:
+                pdf.close()
 
     def _extract_with_pdfplumber(self, file_path: str) -> Dict[int, str]:
         """Extract text using pdfplumber."""
         pages_text = {}
 
         with pdfplumber.open(file_path) as pdf:
-            if len(pdf.pages) == 0:
+            total_pages = len(pdf.pages)
+            if total_pages == 0:
                 raise PDFProcessingError("El PDF está vacío (0 páginas)")
 
-            for page_num, page in enumerate(pdf.pages, start=1):
-                text = page.extract_text()
-                if text:
-                    pages_text[page_num] = text.strip()
-                else:
-                    pages_text[page_num] = ""
+            if total_pages < MIN_PAGES_FOR_PARALLEL or self.max_workers == 1:
+                for page_num, page in enumerate(pdf.pages, start=1):
+                    text = page.extract_text()
+                    if text:
+                        pages_text[page_num] = text.strip()
+                    else:
+                        pages_text[page_num] = ""
+                return pages_text
+
+        # pdfplumber is CPU-bound, so split the pages across worker processes
+        workers = min(self.max_workers, total_pages)
+        step = -(-total_pages // workers)
+        executor = self._get_executor()
+        futures = [
+            executor.submit(
+                _extract_page_range, file_path, start, min(start + step - 1, total_pages)
+            )
+            for start in range(1, total_pages + 1, step)
+        ]
+        for future in futures:
+            pages_text.update(future.result())
 
         return pages_text
 
@@ -60,20 +243,17 @@ class PDFService:
         pages_text = {}
 
         with open(file_path, "rb") as file:
-            reader = PyPDF2.PdfReader(file)
-
-            if len(reader.pages) == 0:
-                raise PDFProcessingError("El PDF está vacío (0 páginas)")
+            # strict=False tolerates minor spec violations instead of validating them
+            reader = PyPDF2.PdfReader(file, strict=False)
 
             if reader.is_encrypted:
                 raise PDFProcessingError("El PDF está encriptado y no se puede procesar")
 
-            for page_num in range(len(reader.pages)):
-                page = reader.pages[page_num]
+            if not reader.pages:
+                raise PDFProcessingError("El PDF está vacío (0 páginas)")
+
+            for page_num, page in enumerate(reader.pages, start=1):
                 text = page.extract_text()
-                if text:
-                    pages_text[page_num + 1] = text.strip()
-                else:
-                    pages_text[page_num + 1] = ""
+                pages_text[page_num] = text.strip() if text else ""
 
         return pages_text
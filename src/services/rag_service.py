@@ -1,47 +1,50 @@
 """RAG service orchestrating the complete question-answering flow."""
 
+import asyncio
 import logging
 import time
-from typing import Optional
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Optional, Sequence
 from uuid import UUID
 
-from src.core.prompts import SYSTEM_PROMPT_TEMPLATE, format_context_from_chunks
+from fastapi import BackgroundTasks
+
+from src.core.prompts import format_context_from_chunks, format_prompt
 from src.models.query_log import QueryLog
 from src.repositories.document_repo import DocumentRepository
 from src.repositories.query_log_repo import QueryLogRepository
 from src.services.llm_service import LLMService
 from src.services.retrieval_service import RetrievalService
+from src.utils.cache import SemanticCache
 from src.utils.exceptions import RAGSystemError
 
 logger = logging.getLogger(__name__)
 
+# Document used to log queries without a document filter, resolved once per process
+_default_document_id: Optional[UUID] = None
+_default_document_lock = asyncio.Lock()
+
 
+@dataclass(slots=True, frozen=True)
 class RAGResponse:
-    """Response from RAG service."""
+    """
+    Response from RAG service.
 
-    def __init__(
-        self,
-        answer: str,
-        is_answerable: bool,
-        retrieved_chunks_count: int,
-        tokens_used: int,
-        chunk_ids: list[UUID],
-    ):
-        """
-        Initialize RAG response.
+    Frozen because cached responses are shared between requests.
 
-        Args:
-            answer: Generated answer text
-            is_answerable: Whether question was answerable from context
-            retrieved_chunks_count: Number of chunks retrieved
-            tokens_used: Total tokens used in LLM call
-            chunk_ids: List of chunk IDs used
-        """
-        self.answer = answer
-        self.is_answerable = is_answerable
-        self.retrieved_chunks_count = retrieved_chunks_count
-        self.tokens_used = tokens_used
-        self.chunk_ids = chunk_ids
+    Attributes:
+        answer: Generated answer text
+        is_answerable: Whether question was answerable from context
+        retrieved_chunks_count: Number of chunks retrieved
+        tokens_used: Total tokens used in LLM call
+        chunk_ids: IDs of the chunks used, as a tuple so shared responses stay immutable
+    """
+
+    answer: str
+    is_answerable: bool
+    retrieved_chunks_count: int
+    tokens_used: int
+    chunk_ids: tuple[UUID, ...]
 
 
 class RAGService:
@@ -50,12 +53,19 @@ class RAGService:
     # Phrase indicating question cannot be answered from context
     NOT_ANSWERABLE_PHRASE = "Lo siento, esa información no se encuentra en el documento"
 
+    # Answer returned when retrieval finds no relevant chunks
+    NO_CONTEXT_ANSWER = (
+        "Lo siento, no encontré información relevante en el documento para responder tu pregunta."
+    )
+
     def __init__(
         self,
         retrieval_service: RetrievalService,
         llm_service: LLMService,
         query_log_repo: QueryLogRepository,
         document_repo: DocumentRepository,
+        background_tasks: Optional[BackgroundTasks] = None,
+        answer_cache: Optional[SemanticCache["RAGResponse"]] = None,
     ):
         """
         Initialize RAG service.
@@ -65,11 +75,16 @@ class RAGService:
             llm_service: Service for generating answers
             query_log_repo: Repository for logging queries
             document_repo: Repository for document operations
+            background_tasks: Request background tasks; when given, query logs are
+                written after the response is sent instead of before
+            answer_cache: Shared cache reusing answers for near-duplicate questions
         """
         self.retrieval_service = retrieval_service
         self.llm_service = llm_service
         self.query_log_repo = query_log_repo
         self.document_repo = document_repo
+        self.background_tasks = background_tasks
+        self.answer_cache = answer_cache
 
     async def answer_question(
         self,
@@ -92,48 +107,59 @@ class RAGService:
         if not question or not question.strip():
             raise RAGSystemError("No se puede responder pregunta vacía")
 
-        start_time = time.time()
-
-        # Get document_id for logging (use provided or get first available)
-        log_document_id = document_id
-        if not log_document_id:
-            log_document_id = await self._get_first_document_id()
+        start_ns = time.perf_counter_ns()
 
         try:
             logger.info(
-                f"answer_question called with question='{question[:50]}...', "
-                f"document_id={document_id}"
+                "answer_question called with question='%.50s...', document_id=%s",
+                question,
+                document_id,
             )
 
+            # Reuse the answer to a near-identical earlier question over the same scope;
+            # the embedding is cached, so retrieval on a miss does not request it again
+            answer_scope = (document_id, "answer")
+            if self.answer_cache is not None:
+                query_embedding = await self.retrieval_service.embed_query(question)
+                cached = self.answer_cache.get(answer_scope, query_embedding)
+                if cached is not None:
+                    logger.info("Answer cache hit")
+                    await self._record_query(
+                        document_id=document_id,
+                        question=question,
+                        answer=cached.answer,
+                        is_answerable=cached.is_answerable,
+                        chunk_ids=cached.chunk_ids,
+                        response_time_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+                    )
+                    # No LLM call was made for this request
+                    return replace(cached, tokens_used=0)
+
             # Retrieve relevant chunks
             logger.info("Calling retrieval_service.retrieve_relevant_chunks")
             chunks_with_scores = await self.retrieval_service.retrieve_relevant_chunks(
                 query=question, document_id=document_id
             )
 
-            logger.info(f"Retrieved {len(chunks_with_scores)} chunks")
+            logger.info("Retrieved %d chunks", len(chunks_with_scores))
 
             # Check if we found any relevant context
             if not chunks_with_scores:
                 logger.warning("No relevant chunks found for query")
-                answer = (
-                    "Lo siento, no encontré información relevante en el documento"
-                    " para responder tu pregunta."
-                )
+                answer = self.NO_CONTEXT_ANSWER
                 is_answerable = False
-                chunk_ids = []
+                chunk_ids = ()
                 tokens_used = 0
 
                 # Log query even when no chunks found
-                if log_document_id:
-                    await self._log_query(
-                        document_id=log_document_id,
-                        question=question,
-                        answer=answer,
-                        is_answerable=is_answerable,
-                        chunk_ids=chunk_ids,
-                        response_time_ms=int((time.time() - start_time) * 1000),
-                    )
+                await self._record_query(
+                    document_id=document_id,
+                    question=question,
+                    answer=answer,
+                    is_answerable=is_answerable,
+                    chunk_ids=chunk_ids,
+                    response_time_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+                )
 
                 return RAGResponse(
                     answer=answer,
@@ -143,71 +169,210 @@ class RAGService:
                     chunk_ids=chunk_ids,
                 )
 
-            # Format context from retrieved chunks
-            context = format_context_from_chunks(chunks_with_scores)
-
-            # Build prompt
-            prompt = f"{SYSTEM_PROMPT_TEMPLATE}\n\nContexto:\n{context}\n\nPregunta: {question}"
+            # Build prompt from retrieved chunks
+            prompt = self._build_prompt(question, chunks_with_scores)
 
             # Generate answer
-            answer, tokens_used = self.llm_service.generate_answer(prompt)
+            answer, tokens_used = await self.llm_service.generate_answer(prompt)
 
             # Determine if question was answerable
             is_answerable = self.NOT_ANSWERABLE_PHRASE not in answer
 
             # Extract chunk IDs
-            chunk_ids = [chunk.id for chunk, _ in chunks_with_scores]
+            chunk_ids = tuple(chunk.id for chunk, _ in chunks_with_scores)
 
             # Calculate response time
-            response_time_ms = int((time.time() - start_time) * 1000)
+            response_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
             # Log query to database
-            if log_document_id:
-                await self._log_query(
-                    document_id=log_document_id,
-                    question=question,
-                    answer=answer,
-                    is_answerable=is_answerable,
-                    chunk_ids=chunk_ids,
-                    response_time_ms=response_time_ms,
-                )
+            await self._record_query(
+                document_id=document_id,
+                question=question,
+                answer=answer,
+                is_answerable=is_answerable,
+                chunk_ids=chunk_ids,
+                response_time_ms=response_time_ms,
+            )
 
-            return RAGResponse(
+            response = RAGResponse(
                 answer=answer,
                 is_answerable=is_answerable,
                 retrieved_chunks_count=len(chunks_with_scores),
                 tokens_used=tokens_used,
                 chunk_ids=chunk_ids,
             )
+            if self.answer_cache is not None:
+                self.answer_cache.set(answer_scope, query_embedding, response)
+            return response
 
         except Exception as e:
             if isinstance(e, RAGSystemError):
                 raise
             raise RAGSystemError(f"Error al responder pregunta: {str(e)}")
 
+    async def stream_answer(
+        self,
+        question: str,
+        document_id: Optional[UUID] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Answer a question using RAG, returning the answer as the LLM generates it.
+
+        Validation, retrieval and the start of generation run when this is
+        awaited, so their failures surface before a streaming response is sent;
+        only the remaining LLM deltas are produced by the returned iterator. The
+        query is logged once the stream completes.
+
+        Args:
+            question: User's question
+            document_id: Optional document ID to limit search
+
+        Returns:
+            Async iterator of answer text deltas
+
+        Raises:
+            RAGSystemError: If answering fails
+        """
+        if not question or not question.strip():
+            raise RAGSystemError("No se puede responder pregunta vacía")
+
+        start_ns = time.perf_counter_ns()
+
+        try:
+            chunks_with_scores = await self.retrieval_service.retrieve_relevant_chunks(
+                query=question, document_id=document_id
+            )
+
+            if not chunks_with_scores:
+                logger.warning("No relevant chunks found for query")
+                return self._stream_deltas(
+                    question, document_id, [], None, self.NO_CONTEXT_ANSWER, start_ns, []
+                )
+
+            prompt = self._build_prompt(question, chunks_with_scores)
+            # Total tokens arrive with the final chunk, after the last delta
+            tokens_used: list[int] = []
+            deltas = aiter(self.llm_service.stream_answer(prompt, on_usage=tokens_used.append))
+            first_delta = await anext(deltas, "")
+            chunk_ids = [chunk.id for chunk, _ in chunks_with_scores]
+            return self._stream_deltas(
+                question, document_id, chunk_ids, deltas, first_delta, start_ns, tokens_used
+            )
+
+        except Exception as e:
+            if isinstance(e, RAGSystemError):
+                raise
+            raise RAGSystemError(f"Error al responder pregunta: {str(e)}")
+
+    async def _stream_deltas(
+        self,
+        question: str,
+        document_id: Optional[UUID],
+        chunk_ids: list[UUID],
+        deltas: Optional[AsyncIterator[str]],
+        first_delta: str,
+        start_ns: int,
+        tokens_used: list[int],
+    ) -> AsyncIterator[str]:
+        """
+        Yield the answer deltas, then log the query and its token usage.
+
+        Args:
+            question: User's question
+            document_id: Optional document ID the search was limited to
+            chunk_ids: IDs of the chunks used as context
+            deltas: Remaining LLM deltas, or None when the answer is complete
+            first_delta: Text already produced before streaming started
+            start_ns: perf_counter_ns() when the question was received
+            tokens_used: Filled with the LLM's total token count when the stream ends
+
+        Yields:
+            Answer text deltas
+
+        Raises:
+            RAGSystemError: If generation fails mid-stream
+        """
+        try:
+            parts = [first_delta]
+            if first_delta:
+                yield first_delta
+            if deltas is not None:
+                async for delta in deltas:
+                    parts.append(delta)
+                    yield delta
+            answer = "".join(parts)
+            if tokens_used:
+                logger.info("Streamed answer used %d tokens", tokens_used[-1])
+
+            await self._record_query(
+                document_id=document_id,
+                question=question,
+                answer=answer,
+                is_answerable=bool(chunk_ids) and self.NOT_ANSWERABLE_PHRASE not in answer,
+                chunk_ids=chunk_ids,
+                response_time_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+            )
+
+        except Exception as e:
+            if isinstance(e, RAGSystemError):
+                raise
+            raise RAGSystemError(f"Error al responder pregunta: {str(e)}")
+
+    @staticmethod
+    def _build_prompt(question: str, chunks_with_scores: list[tuple]) -> str:
+        """
+        Build the LLM prompt from the question and retrieved chunks.
+
+        Args:
+            question: User's question
+            chunks_with_scores: List of (chunk, score) tuples from retrieval
+
+        Returns:
+            Complete prompt for the LLM
+        """
+        return format_prompt(format_context_from_chunks(chunks_with_scores), question)
+
+    async def _record_query(self, **log_fields) -> None:
+        """
+        Log a query, after the response when background tasks are available.
+
+        Args:
+            **log_fields: Keyword arguments for _log_query
+        """
+        if self.background_tasks is not None:
+            self.background_tasks.add_task(self._log_query, **log_fields)
+        else:
+            await self._log_query(**log_fields)
+
     async def _log_query(
         self,
-        document_id: UUID,
+        document_id: Optional[UUID],
         question: str,
         answer: str,
         is_answerable: bool,
-        chunk_ids: list[UUID],
+        chunk_ids: Sequence[UUID],
         response_time_ms: int,
     ):
         """
         Log query to database.
 
         Args:
-            document_id: Document UUID
+            document_id: Document UUID, or None to log against the first document
             question: User's question
             answer: Generated answer
             is_answerable: Whether question was answerable
             chunk_ids: List of chunk IDs used
             response_time_ms: Response time in milliseconds
         """
+        global _default_document_id
+
         try:
+            log_document_id = document_id or await self._get_first_document_id()
+            if not log_document_id:
+                return
+
             query_log = QueryLog(
-                document_id=document_id,
+                document_id=log_document_id,
                 query_text=question,
                 answer_text=answer,
                 retrieved_chunks=[str(chunk_id) for chunk_id in chunk_ids],
@@ -215,24 +380,36 @@ class RAGService:
                 response_time_ms=response_time_ms,
             )
             await self.query_log_repo.create(query_log)
-            logger.info(f"Query logged successfully for document {document_id}")
+            logger.info("Query logged successfully for document %s", log_document_id)
         except Exception as e:
-            # Don't fail the request if logging fails
-            logger.error(f"Failed to log query: {str(e)}")
+            # Don't fail the request if logging fails; the cached document may be gone
+            _default_document_id = None
+            logger.error("Failed to log query: %s", e)
 
     async def _get_first_document_id(self) -> Optional[UUID]:
         """
         Get first available document ID for logging queries without document_id.
 
+        The result is cached for the process, so only the first query pays for
+        the lookup.
+
         Returns:
             First document UUID or None if no documents exist
         """
-        try:
-            documents = await self.document_repo.list_all(limit=1)
-            if documents:
-                return documents[0].id
-            logger.warning("No documents found in database for query logging")
-            return None
-        except Exception as e:
-            logger.error(f"Failed to get first document ID: {str(e)}")
-            return None
+        global _default_document_id
+
+        if _default_document_id is not None:
+            return _default_document_id
+
+        async with _default_document_lock:
+            if _default_document_id is None:
+                try:
+                    documents = await self.document_repo.list_all(limit=1)
+                except Exception as e:
+                    logger.error("Failed to get first document ID: %s", e)
+                    return None
+                if not documents:
+                    logger.warning("No documents found in database for query logging")
+                    return None
+                _default_document_id = documents[0].id
+        return _default_document_id
@@ -7,7 +7,9 @@ from uuid import UUID
 from src.models.chunk import Chunk
 from src.repositories.vector_repo import VectorRepository
 from src.services.embedding_service import EmbeddingService
+from src.utils.cache import SemanticCache
 from src.utils.exceptions import RAGSystemError
+from src.utils.text_processing import clean_text
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +23,7 @@ class RetrievalService:
         embedding_service: EmbeddingService,
         top_k: int = 5,
         min_similarity: float = 0.3,
+        semantic_cache: Optional[SemanticCache[list[tuple[Chunk, float]]]] = None,
     ):
         """
         Initialize retrieval service.
@@ -30,11 +33,28 @@ class RetrievalService:
             embedding_service: Service for generating embeddings
             top_k: Number of results to retrieve
             min_similarity: Minimum similarity threshold (0-1)
+            semantic_cache: Shared cache reusing results for near-duplicate queries
         """
         self.vector_repo = vector_repo
         self.embedding_service = embedding_service
         self.top_k = top_k
         self.min_similarity = min_similarity
+        self.semantic_cache = semantic_cache
+
+    async def embed_query(self, query: str) -> list[float]:
+        """
+        Embed a query the way retrieval does.
+
+        Whitespace variants share an embedding, and repeated queries are served
+        from the embedding service's cache.
+
+        Args:
+            query: User query text
+
+        Returns:
+            Query embedding
+        """
+        return await self.embedding_service.embed_text(clean_text(query))
 
     async def retrieve_relevant_chunks(
         self,
@@ -63,19 +83,28 @@ class RetrievalService:
 
         try:
             logger.info(
-                f"retrieve_relevant_chunks called with query='{query[:50]}...', "
-                f"document_id={document_id}"
+                "retrieve_relevant_chunks called with query='%.50s...', document_id=%s",
+                query,
+                document_id,
             )
 
-            # Generate embedding for query
-            query_embedding = self.embedding_service.embed_text(query)
-            logger.info(f"Generated embedding with {len(query_embedding)} dimensions")
+            # Generate embedding for query; whitespace variants share a cache entry
+            query_embedding = await self.embed_query(query)
+            logger.info("Generated embedding with %d dimensions", len(query_embedding))
 
             # Use provided values or defaults
             k = top_k if top_k is not None else self.top_k
             min_score = min_similarity if min_similarity is not None else self.min_similarity
 
-            logger.info(f"Calling similarity_search with top_k={k}, min_score={min_score}")
+            # Reuse results of a near-identical earlier query over the same scope
+            scope = (document_id, k, min_score)
+            if self.semantic_cache is not None:
+                cached = self.semantic_cache.get(scope, query_embedding)
+                if cached is not None:
+                    logger.info("Semantic cache hit with %d results", len(cached))
+                    return cached
+
+            logger.info("Calling similarity_search with top_k=%d, min_score=%s", k, min_score)
 
             # Perform similarity search
             results = await self.vector_repo.similarity_search(
@@ -85,7 +114,10 @@ class RetrievalService:
                 document_id=document_id,
             )
 
-            logger.info(f"similarity_search returned {len(results)} results")
+            logger.info("similarity_search returned %d results", len(results))
+
+            if self.semantic_cache is not None:
+                self.semantic_cache.set(scope, query_embedding, results)
 
             return results
 
@@ -0,0 +1,241 @@
+"""In-process caching utilities."""
+
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, List, Optional, TypeVar
+from uuid import UUID
+
+import numpy as np
+
+ValueType = TypeVar("ValueType")
+
+
+class LRUCache(Generic[ValueType]):
+    """Bounded least-recently-used cache backed by an OrderedDict."""
+
+    def __init__(self, max_size: int = 10_000):
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Maximum number of entries kept before evicting the oldest
+        """
+        self.max_size = max_size
+        self._data: OrderedDict[Hashable, ValueType] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[ValueType]:
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if missing
+        """
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: ValueType) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _quantize(vector: np.ndarray) -> tuple[np.ndarray, float]:
+    """
+    Quantize a vector to int8 with one symmetric scale.
+
+    The scale also divides out the vector's norm, so dot products of two
+    quantized vectors times both scales are cosine similarities.
+
+    Args:
+        vector: float32 vector
+
+    Returns:
+        Tuple of (int8 vector, scale mapping int8 units back to the unit vector)
+    """
+    peak = float(np.max(np.abs(vector)))
+    if peak == 0:
+        return np.zeros(len(vector), dtype=np.int8), 0.0
+    norm = float(np.linalg.norm(vector))
+    return np.round(vector * (127 / peak)).astype(np.int8), peak / (127 * norm)
+
+
+class _SemanticScope(Generic[ValueType]):
+    """
+    Cached results for one search scope.
+
+    Query embeddings live as normalized int8 rows (one scale per row) of a
+    preallocated matrix: a quarter of the float32 footprint, with quantization error around
+    1e-3 in cosine, well inside the hit threshold's margin. Inserts write a
+    single row in place and lookups are one integer matrix-vector product.
+    Freed rows are zeroed, which keeps them below any positive threshold.
+    """
+
+    INITIAL_CAPACITY = 16
+
+    def __init__(self, dim: int):
+        self.matrix = np.zeros((self.INITIAL_CAPACITY, dim), dtype=np.int8)
+        self.scales = np.zeros(self.INITIAL_CAPACITY, dtype=np.float32)
+        self.values: list[Optional[ValueType]] = [None] * self.INITIAL_CAPACITY
+        self.expires_at = np.zeros(self.INITIAL_CAPACITY)
+        # Occupied rows in least-recently-used order
+        self.lru: OrderedDict[int, None] = OrderedDict()
+        self.free_rows: list[int] = []
+        self.used_rows = 0
+
+    def lookup(self, embedding: np.ndarray, threshold: float, now: float) -> Optional[ValueType]:
+        """Return the value of the most similar live row, if similar enough."""
+        if not self.lru:
+            return None
+        quantized, scale = _quantize(embedding)
+        if scale == 0:
+            return None
+
+        # Accumulate in int32 so 1536 products of int8 values cannot overflow
+        dots = np.einsum("ij,j->i", self.matrix[: self.used_rows], quantized, dtype=np.int32)
+        scores = dots * (self.scales[: self.used_rows] * scale)
+
+        # Free expired rows and keep them out of the argmax, so a stale best match
+        # cannot hide a live one above the threshold
+        expired = self.expires_at[: self.used_rows] <= now
+        if expired.any():
+            for row in np.flatnonzero(expired):
+                self.remove(int(row))
+            scores[expired] = -np.inf
+
+        row = int(np.argmax(scores))
+        if scores[row] < threshold:
+            return None
+
+        self.lru.move_to_end(row)
+        return self.values[row]
+
+    def insert(self, embedding: np.ndarray, value: ValueType, expires_at: float, max_size: int):
+        """Store a row, reusing the least recently used one when the scope is full."""
+        if len(self.lru) >= max_size:
+            row, _ = self.lru.popitem(last=False)
+        elif self.free_rows:
+            row = self.free_rows.pop()
+        else:
+            row = self.used_rows
+            self.used_rows += 1
+            if row == len(self.matrix):
+                self._grow()
+
+        self.matrix[row], self.scales[row] = _quantize(embedding)
+        self.values[row] = value
+        self.expires_at[row] = expires_at
+        self.lru[row] = None
+
+    def remove(self, row: int) -> None:
+        """Free a row for reuse; it never counts as expired again until reused."""
+        self.matrix[row] = 0
+        self.scales[row] = 0
+        self.values[row] = None
+        self.expires_at[row] = np.inf
+        del self.lru[row]
+        self.free_rows.append(row)
+
+    def _grow(self) -> None:
+        """Double the row capacity."""
+        capacity = len(self.matrix)
+        self.matrix = np.vstack([self.matrix, np.zeros_like(self.matrix)])
+        self.scales = np.concatenate([self.scales, np.zeros_like(self.scales)])
+        self.values.extend([None] * capacity)
+        self.expires_at = np.concatenate([self.expires_at, np.zeros(capacity)])
+
+
+class SemanticCache(Generic[ValueType]):
+    """
+    Cache of search results or answers keyed by query embedding.
+
+    A lookup hits when a stored query embedding has cosine similarity at or above
+    the threshold with the new one, so near-duplicate questions reuse earlier
+    results. Embeddings need not be unit length. Entries are grouped per scope
+    (document filter plus search parameters or result kind), expire after a TTL
+    and are evicted least recently used beyond max_size per scope.
+    """
+
+    def __init__(self, threshold: float = 0.97, max_size: int = 1024, ttl_seconds: float = 300):
+        """
+        Initialize cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_size: Maximum number of entries kept per scope
+            ttl_seconds: Seconds an entry stays valid
+        """
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._scopes: dict[tuple, _SemanticScope[ValueType]] = {}
+
+    def get(self, scope: tuple, embedding: List[float]) -> Optional[ValueType]:
+        """
+        Get the value cached for the most similar earlier query in a scope.
+
+        Args:
+            scope: Search scope; its first element is the document filter or None
+            embedding: Query embedding
+
+        Returns:
+            Cached value or None if no stored query is similar enough
+        """
+        entries = self._scopes.get(scope)
+        if entries is None:
+            return None
+        return entries.lookup(
+            np.asarray(embedding, dtype=np.float32), self.threshold, time.monotonic()
+        )
+
+    def set(self, scope: tuple, embedding: List[float], value: ValueType) -> None:
+        """
+        Store a value for a query embedding, evicting the least recently used if full.
+
+        Args:
+            scope: Search scope; its first element is the document filter or None
+            embedding: Query embedding
+            value: Value to store
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        entries = self._scopes.get(scope)
+        if entries is None:
+            entries = self._scopes[scope] = _SemanticScope(len(vector))
+        entries.insert(vector, value, time.monotonic() + self.ttl_seconds, self.max_size)
+
+    def invalidate(self, document_id: UUID) -> None:
+        """
+        Drop results that may change when a document is added or removed.
+
+        Args:
+            document_id: Document that changed; unfiltered scopes are dropped too
+        """
+        for scope in list(self._scopes):
+            if scope[0] is None or scope[0] == document_id:
+                del self._scopes[scope]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._scopes.clear()
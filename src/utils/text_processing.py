@@ -1,7 +1,7 @@
 """Text processing utilities for cleaning and token counting."""
 
-import re
 import unicodedata
+from functools import lru_cache
 
 import tiktoken
 
@@ -16,16 +16,48 @@ def clean_text(text: str) -> str:
     Returns:
         Cleaned text with normalized spacing and unicode
     """
-    # Normalize unicode (NFD -> NFC for Spanish characters)
-    text = unicodedata.normalize("NFC", text)
+    # Normalize unicode (NFD -> NFC for Spanish characters). ASCII text is always
+    # NFC, and isascii() reads a flag stored on the string instead of scanning it;
+    # otherwise is_normalized is a fast scan that skips the copy for NFC text
+    if not text.isascii() and not unicodedata.is_normalized("NFC", text):
+        text = unicodedata.normalize("NFC", text)
 
-    # Replace multiple whitespace with single space
-    text = re.sub(r"\s+", " ", text)
+    # Collapse whitespace runs to one space and trim the ends in a single pass;
+    # str.split() uses the same Unicode whitespace set as the regex \s
+    return " ".join(text.split())
 
-    # Remove leading/trailing whitespace
-    text = text.strip()
 
-    return text
+# OpenAI models used here that tokenize with cl100k_base
+CL100K_MODELS = frozenset(
+    {
+        "gpt-4",
+        "gpt-4-turbo-preview",
+        "gpt-3.5-turbo",
+        "text-embedding-3-small",
+        "text-embedding-3-large",
+        "text-embedding-ada-002",
+    }
+)
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """
+    Resolve the tiktoken encoding for a model once and reuse it.
+
+    Args:
+        model: Model name for tokenization
+
+    Returns:
+        Encoding for the model, or cl100k_base for unknown models
+    """
+    if model in CL100K_MODELS:
+        return tiktoken.get_encoding("cl100k_base")
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Fallback to cl100k_base for unknown models
+        return tiktoken.get_encoding("cl100k_base")
 
 
 def count_tokens(text: str, model: str = "gpt-4") -> int:
@@ -39,11 +71,4 @@ def count_tokens(text: str, model: str = "gpt-4") -> int:
     Returns:
         Number of tokens in the text
     """
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        # Fallback to cl100k_base for unknown models
-        encoding = tiktoken.get_encoding("cl100k_base")
-
-    tokens = encoding.encode(text)
-    return len(tokens)
+    return len(_get_encoding(model).encode(text))
@@ -1,29 +1,37 @@
 """File validation utilities."""
 
-from pathlib import Path
+import os
+from typing import Iterable, Optional
 
 from src.utils.exceptions import FileSizeExceededError, InvalidFileTypeError
 
+# Built once so the common upload path does a single set lookup
+DEFAULT_ALLOWED_EXTENSIONS = frozenset({".pdf"})
 
-def validate_file_type(filename: str, allowed_extensions: list[str] = None) -> None:
+_MB = 1024 * 1024
+
+
+def validate_file_type(filename: str, allowed_extensions: Optional[Iterable[str]] = None) -> None:
     """
     Validate that the file has an allowed extension.
 
     Args:
         filename: Name of the file to validate
-        allowed_extensions: List of allowed extensions (e.g., [".pdf"])
+        allowed_extensions: Allowed extensions (e.g., [".pdf"]); defaults to PDF only
 
     Raises:
         InvalidFileTypeError: If file extension is not allowed
     """
     if allowed_extensions is None:
-        allowed_extensions = [".pdf"]
+        extensions = DEFAULT_ALLOWED_EXTENSIONS
+    else:
+        extensions = frozenset(ext.lower() for ext in allowed_extensions)
 
-    file_ext = Path(filename).suffix.lower()
+    file_ext = os.path.splitext(filename)[1].lower()
 
-    if file_ext not in allowed_extensions:
+    if file_ext not in extensions:
         raise InvalidFileTypeError(
-            f"Solo se aceptan archivos {', '.join(allowed_extensions)}. "
+            f"Solo se aceptan archivos {', '.join(sorted(extensions))}. "
             f"Recibido: {file_ext or 'sin extensión'}"
         )
 
@@ -39,10 +47,9 @@ def validate_file_size(file_size: int, max_size_mb: int = 50) -> None:
     Raises:
         FileSizeExceededError: If file size exceeds the limit
     """
-    max_size_bytes = max_size_mb * 1024 * 1024
+    if file_size <= max_size_mb * _MB:
+        return
 
-    if file_size > max_size_bytes:
-        actual_mb = file_size / (1024 * 1024)
-        raise FileSizeExceededError(
-            f"Tamaño máximo permitido: {max_size_mb}MB. Archivo recibido: {actual_mb:.2f}MB"
-        )
+    raise FileSizeExceededError(
+        f"Tamaño máximo permitido: {max_size_mb}MB. Archivo recibido: {file_size / _MB:.2f}MB"
+    )
@@ -1,3 +1,19 @@
 """Pytest configuration and shared fixtures."""
 
+from itertools import count
+from uuid import UUID
+
 import pytest
+
+
+@pytest.fixture(autouse=True)
+def deterministic_uuids(request, monkeypatch):
+    """
+    Replace the test module's uuid4 with a counter over fixed UUIDs.
+
+    IDs stay unique within a test but skip the os.urandom read of uuid4.
+    Application code keeps the real uuid4.
+    """
+    if hasattr(request.module, "uuid4"):
+        counter = count(1)
+        monkeypatch.setattr(request.module, "uuid4", lambda: UUID(int=next(counter)))
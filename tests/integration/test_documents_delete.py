@@ -5,9 +5,9 @@ from uuid import uuid4
 import pytest
 from httpx import ASGITransport, AsyncClient
 
-from src.api.dependencies import get_document_repo, get_query_log_repo, get_vector_repo
+from src.api.dependencies import get_document_repo, get_semantic_cache
 from src.main import app
-from src.models.document import Document, DocumentStatus
+from src.utils.cache import SemanticCache
 
 
 class DummySession:
@@ -27,60 +27,31 @@ class DummySession:
 class DummyDocumentRepo:
     """Document repository stub for delete route tests."""
 
-    def __init__(self, document, session: DummySession, fail_on_delete: bool = False):
-        self.document = document
+    def __init__(self, exists: bool, session: DummySession, fail_on_delete: bool = False):
+        self.exists = exists
         self.session = session
         self.fail_on_delete = fail_on_delete
-        self.deleted_document = None
-
-    async def get_by_id(self, document_id):
-        return self.document
+        self.deleted_document_id = None
 
-    async def delete(self, document, commit: bool = True):
-        self.deleted_document = document
+    async def delete_by_id(self, document_id, commit: bool = True):
         if self.fail_on_delete:
             raise RuntimeError('delete failed')
-
-
-class DummyVectorRepo:
-    """Vector repository stub for delete route tests."""
-
-    def __init__(self, session: DummySession):
-        self.session = session
-        self.deleted_document_id = None
-
-    async def delete_chunks_by_document_id(self, document_id, commit: bool = True):
-        self.deleted_document_id = document_id
-
-
-class DummyQueryLogRepo:
-    """Query log repository stub for delete route tests."""
-
-    def __init__(self, session: DummySession):
-        self.session = session
-        self.deleted_document_id = None
-
-    async def delete_by_document_id(self, document_id, commit: bool = True):
+        if not self.exists:
+            return False
         self.deleted_document_id = document_id
+        return True
 
 
 @pytest.fixture
 async def delete_client():
     """Provide a helper that mounts repo overrides for delete tests."""
 
-    async def _make_client(document_repo, vector_repo, query_log_repo):
+    async def _make_client(document_repo):
         async def override_get_document_repo():
             return document_repo
 
-        async def override_get_vector_repo():
-            return vector_repo
-
-        async def override_get_query_log_repo():
-            return query_log_repo
-
         app.dependency_overrides[get_document_repo] = override_get_document_repo
-        app.dependency_overrides[get_vector_repo] = override_get_vector_repo
-        app.dependency_overrides[get_query_log_repo] = override_get_query_log_repo
+        app.dependency_overrides[get_semantic_cache] = SemanticCache
 
         return AsyncClient(transport=ASGITransport(app=app), base_url='http://test')
 
@@ -93,24 +64,14 @@ async def test_delete_document_returns_204_and_commits_once(delete_client):
     """Delete succeeds and finalizes the transaction once."""
     document_id = uuid4()
     session = DummySession()
-    document = Document(
-        id=document_id,
-        filename='demo.pdf',
-        file_size=123,
-        status=DocumentStatus.ready,
-    )
-    document_repo = DummyDocumentRepo(document=document, session=session)
-    vector_repo = DummyVectorRepo(session=session)
-    query_log_repo = DummyQueryLogRepo(session=session)
-
-    async with await delete_client(document_repo, vector_repo, query_log_repo) as client:
+    document_repo = DummyDocumentRepo(exists=True, session=session)
+
+    async with await delete_client(document_repo) as client:
         response = await client.delete(f'/documents/{document_id}')
 
     assert response.status_code == 204
     assert response.text == ''
-    assert query_log_repo.deleted_document_id == document_id
-    assert vector_repo.deleted_document_id == document_id
-    assert document_repo.deleted_document == document
+    assert document_repo.deleted_document_id == document_id
     assert session.commit_calls == 1
     assert session.rollback_calls == 0
 
@@ -120,17 +81,14 @@ async def test_delete_document_returns_404_when_missing(delete_client):
     """Delete returns not found when the document does not exist."""
     document_id = uuid4()
     session = DummySession()
-    document_repo = DummyDocumentRepo(document=None, session=session)
-    vector_repo = DummyVectorRepo(session=session)
-    query_log_repo = DummyQueryLogRepo(session=session)
+    document_repo = DummyDocumentRepo(exists=False, session=session)
 
-    async with await delete_client(document_repo, vector_repo, query_log_repo) as client:
+    async with await delete_client(document_repo) as client:
         response = await client.delete(f'/documents/{document_id}')
 
     assert response.status_code == 404
     assert response.json()['detail'] == 'Documento no encontrado'
-    assert query_log_repo.deleted_document_id is None
-    assert vector_repo.deleted_document_id is None
+    assert document_repo.deleted_document_id is None
     assert session.commit_calls == 0
 
 
@@ -139,22 +97,12 @@ async def test_delete_document_rolls_back_when_delete_fails(delete_client):
     """Delete failure rolls back instead of leaving a partial commit path."""
     document_id = uuid4()
     session = DummySession()
-    document = Document(
-        id=document_id,
-        filename='demo.pdf',
-        file_size=123,
-        status=DocumentStatus.ready,
-    )
-    document_repo = DummyDocumentRepo(document=document, session=session, fail_on_delete=True)
-    vector_repo = DummyVectorRepo(session=session)
-    query_log_repo = DummyQueryLogRepo(session=session)
-
-    async with await delete_client(document_repo, vector_repo, query_log_repo) as client:
+    document_repo = DummyDocumentRepo(exists=True, session=session, fail_on_delete=True)
+
+    async with await delete_client(document_repo) as client:
         response = await client.delete(f'/documents/{document_id}')
 
     assert response.status_code == 500
     assert response.json()['detail'] == 'Error interno del servidor'
-    assert query_log_repo.deleted_document_id == document_id
-    assert vector_repo.deleted_document_id == document_id
     assert session.commit_calls == 0
     assert session.rollback_calls == 1
@@ -1,67 +1,84 @@
 """Tests for document deletion endpoint."""
 
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 import pytest
 from fastapi import HTTPException
 
 from src.api.routes.documents import delete_document
-from src.models.document import Document, DocumentStatus
 
 
 @pytest.mark.asyncio
-async def test_delete_document_removes_query_logs_before_document():
-    """Deleting a document must clear query_logs to avoid FK violation."""
+async def test_delete_document_issues_single_delete():
+    """Deleting a document is one DELETE; dependents go via ON DELETE CASCADE."""
     document_id = uuid4()
-    document = Document(
-        id=document_id,
-        filename="test.pdf",
-        file_size=1000,
-        status=DocumentStatus.ready,
-    )
 
     session = AsyncMock()
     document_repo = AsyncMock()
     document_repo.session = session
-    document_repo.get_by_id.return_value = document
-    document_repo.delete = AsyncMock()
-
-    vector_repo = AsyncMock()
-    vector_repo.delete_chunks_by_document_id = AsyncMock()
+    document_repo.delete_by_id.return_value = True
 
-    query_log_repo = AsyncMock()
-    query_log_repo.delete_by_document_id = AsyncMock()
+    semantic_cache = Mock()
 
     result = await delete_document(
-        document_id=document_id,
-        document_repo=document_repo,
-        vector_repo=vector_repo,
-        query_log_repo=query_log_repo,
+        document_id=document_id, document_repo=document_repo, semantic_cache=semantic_cache
     )
 
     assert result is None
-    query_log_repo.delete_by_document_id.assert_awaited_once_with(document_id, commit=False)
-    vector_repo.delete_chunks_by_document_id.assert_awaited_once_with(document_id, commit=False)
-    document_repo.delete.assert_awaited_once_with(document, commit=False)
+    semantic_cache.invalidate.assert_called_once_with(document_id)
+    document_repo.delete_by_id.assert_awaited_once_with(document_id, commit=False)
+    document_repo.get_by_id.assert_not_awaited()
     session.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
 async def test_delete_document_not_found_raises_404():
     """Deleting a missing document returns 404."""
+    session = AsyncMock()
     document_repo = AsyncMock()
-    document_repo.get_by_id.return_value = None
+    document_repo.session = session
+    document_repo.delete_by_id.return_value = False
 
     with pytest.raises(HTTPException) as exc_info:
         await delete_document(
-            document_id=uuid4(),
-            document_repo=document_repo,
-            vector_repo=AsyncMock(),
-            query_log_repo=AsyncMock(),
+            document_id=uuid4(), document_repo=document_repo, semantic_cache=Mock()
         )
 
     assert exc_info.value.status_code == 404
+    session.commit.assert_not_awaited()
+    session.rollback.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_document_repo_delete_by_id_uses_returning():
+    """DocumentRepository.delete_by_id issues a single DELETE ... RETURNING."""
+    from sqlalchemy.sql.dml import Delete
+
+    from src.repositories.document_repo import DocumentRepository
+
+    session = AsyncMock()
+    result = Mock()
+    result.first.return_value = (uuid4(),)
+    session.execute.return_value = result
+
+    deleted = await DocumentRepository(session).delete_by_id(uuid4())
+
+    assert deleted is True
+    statement = session.execute.await_args.args[0]
+    assert isinstance(statement, Delete)
+    assert statement._returning
+    session.commit.assert_awaited_once()
+
+
+def test_dependent_foreign_keys_cascade_on_delete():
+    """Chunks and query logs are removed by the database with their document."""
+    from src.models.chunk import Chunk
+    from src.models.query_log import QueryLog
+
+    for model in (Chunk, QueryLog):
+        (foreign_key,) = model.__table__.c.document_id.foreign_keys
+        assert foreign_key.ondelete == "CASCADE"
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,46 @@
+"""Tests for health endpoints."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.api.routes import health
+
+
+def make_engine(conn):
+    """Build an engine stub whose connect() yields the given connection."""
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__.return_value = conn
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_liveness_check_needs_no_database():
+    """Liveness probe answers without touching the database."""
+    assert await health.liveness_check() == {"status": "alive"}
+
+
+@pytest.mark.asyncio
+async def test_health_check_pings_database_connection(monkeypatch):
+    """Readiness probe runs SELECT 1 on a bare connection without committing."""
+    conn = AsyncMock()
+    monkeypatch.setattr(health, "get_engine", lambda: make_engine(conn))
+
+    response = await health.health_check()
+
+    assert response.database == "healthy"
+    conn.execute.assert_awaited_once()
+    conn.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_health_check_reports_database_failure(monkeypatch):
+    """Database errors are reported instead of raised."""
+    conn = AsyncMock()
+    conn.execute.side_effect = Exception("connection refused")
+    monkeypatch.setattr(health, "get_engine", lambda: make_engine(conn))
+
+    response = await health.health_check()
+
+    assert response.status == "healthy"
+    assert response.database.startswith("unhealthy: connection refused")
@@ -0,0 +1,55 @@
+"""Tests for document list endpoint."""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import orjson
+import pytest
+
+from src.api.routes.documents import DOC_LIST_LOAD_OPTIONS, list_documents
+from src.models.document import DocumentStatus
+
+
+def make_document(filename: str) -> SimpleNamespace:
+    """Build an ORM-like document row."""
+    return SimpleNamespace(
+        id=uuid4(),
+        filename=filename,
+        file_size=1024,
+        upload_date=datetime(2024, 1, 1, 12, 0, 0),
+        status=DocumentStatus.ready,
+        error_message=None,
+        total_pages=3,
+        total_chunks=7,
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_documents_serializes_rows():
+    """Rows are converted from attributes and serialized in one pass."""
+    documents = [make_document("a.pdf"), make_document("b.pdf")]
+    document_repo = AsyncMock()
+    document_repo.list_all.return_value = documents
+
+    response = await list_documents(document_repo=document_repo, limit=10)
+
+    body = orjson.loads(response.body)
+    assert body["total"] == 2
+    assert [doc["filename"] for doc in body["documents"]] == ["a.pdf", "b.pdf"]
+    assert body["documents"][0]["id"] == str(documents[0].id)
+    assert body["documents"][0]["status"] == "ready"
+    assert body["documents"][0]["upload_date"] == "2024-01-01T12:00:00"
+    document_repo.list_all.assert_awaited_once_with(10, *DOC_LIST_LOAD_OPTIONS)
+
+
+@pytest.mark.asyncio
+async def test_list_documents_empty():
+    """An empty table returns an empty list."""
+    document_repo = AsyncMock()
+    document_repo.list_all.return_value = []
+
+    response = await list_documents(document_repo=document_repo, limit=100)
+
+    assert orjson.loads(response.body) == {"documents": [], "total": 0}
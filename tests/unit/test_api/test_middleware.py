@@ -0,0 +1,69 @@
+"""Tests for ASGI middleware."""
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.api.middleware import add_error_handler_middleware, add_logging_middleware
+from src.utils.exceptions import DocumentNotFoundError
+
+
+@pytest.fixture
+def middleware_app():
+    """Create a minimal app wrapped with the project middleware."""
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"status": "ok"}
+
+    @app.get("/missing")
+    async def missing():
+        raise DocumentNotFoundError("Documento no encontrado")
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    add_logging_middleware(app)
+    add_error_handler_middleware(app)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_logging_middleware_adds_process_time_header(middleware_app):
+    """Successful responses carry the X-Process-Time header."""
+    async with AsyncClient(
+        transport=ASGITransport(app=middleware_app), base_url="http://test"
+    ) as client:
+        response = await client.get("/ok")
+
+    assert response.status_code == 200
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+
+@pytest.mark.asyncio
+async def test_error_handler_maps_document_not_found(middleware_app):
+    """DocumentNotFoundError is mapped to a 404 JSON response."""
+    async with AsyncClient(
+        transport=ASGITransport(app=middleware_app), base_url="http://test"
+    ) as client:
+        response = await client.get("/missing")
+
+    assert response.status_code == 404
+    assert response.json() == {
+        "detail": "Documento no encontrado",
+        "error_type": "DocumentNotFound",
+    }
+
+
+@pytest.mark.asyncio
+async def test_error_handler_hides_unhandled_errors(middleware_app):
+    """Unexpected exceptions become a generic 500 response."""
+    async with AsyncClient(
+        transport=ASGITransport(app=middleware_app), base_url="http://test"
+    ) as client:
+        response = await client.get("/boom")
+
+    assert response.status_code == 500
+    assert response.json()["error_type"] == "InternalServerError"
@@ -0,0 +1,48 @@
+"""Tests for the streaming query endpoint."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from src.api.routes.query import stream_query
+from src.api.schemas import QueryRequest
+from src.utils.exceptions import RAGSystemError
+
+
+async def deltas():
+    """Yield a fixed two-part answer."""
+    yield "El sistema "
+    yield "RAG"
+
+
+@pytest.mark.asyncio
+async def test_stream_query_streams_answer_deltas():
+    """A successful request streams the deltas returned by the service."""
+    rag_service = AsyncMock()
+    rag_service.stream_answer.return_value = deltas()
+
+    response = await stream_query(QueryRequest(question="¿Qué es RAG?"), rag_service)
+
+    assert isinstance(response, StreamingResponse)
+    assert [part async for part in response.body_iterator] == ["El sistema ", "RAG"]
+
+
+@pytest.mark.parametrize(
+    "error,status_code",
+    [
+        pytest.param(RAGSystemError("No se puede responder pregunta vacía"), 400, id="rag_error"),
+        pytest.param(RuntimeError("boom"), 500, id="unexpected_error"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_stream_query_maps_errors_before_streaming(error, status_code):
+    """Failures before the first delta become HTTP errors instead of a truncated 200."""
+    rag_service = AsyncMock()
+    rag_service.stream_answer.side_effect = error
+
+    with pytest.raises(HTTPException) as exc_info:
+        await stream_query(QueryRequest(question="¿Qué es RAG?"), rag_service)
+
+    assert exc_info.value.status_code == status_code
@@ -0,0 +1,156 @@
+"""Tests for document upload endpoint."""
+
+from datetime import datetime
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from src.api.routes.documents import upload_document
+from src.models.document import DocumentStatus
+
+# Only the upload size limit is read from settings
+SETTINGS = SimpleNamespace(max_file_size_mb=50)
+
+
+@pytest.fixture
+def document_repo():
+    """Create mock document repository that assigns IDs on create."""
+    repo = AsyncMock()
+
+    async def create(document):
+        document.id = uuid4()
+        document.upload_date = datetime.utcnow()
+        return document
+
+    repo.create.side_effect = create
+    repo.update.side_effect = lambda document: document
+    return repo
+
+
+@pytest.fixture
+def pipeline_services():
+    """Create mock PDF, chunking and embedding services."""
+    pdf_service = Mock()
+    pdf_service.iter_pages.side_effect = lambda path: iter([(1, "Texto uno"), (2, "Texto dos")])
+
+    chunking_service = Mock()
+    chunking_service.chunk_text.side_effect = lambda pages: [
+        {"content": text, "page_number": page_num, "chunk_index": index, "word_count": 2}
+        for index, (page_num, text) in enumerate(pages)
+    ]
+
+    embedding_service = Mock()
+    embedding_service.embed_batch = AsyncMock()
+    embedding_service.embed_batch.return_value = [[0.1, 0.2], [0.3, 0.4]]
+
+    return pdf_service, chunking_service, embedding_service
+
+
+def make_upload(filename: str = "test.pdf", content: bytes = b"%PDF-1.4 test") -> UploadFile:
+    """Build an UploadFile backed by an in-memory buffer."""
+    return UploadFile(file=BytesIO(content), filename=filename)
+
+
+@pytest.mark.asyncio
+async def test_upload_document_processes_pipeline(document_repo, pipeline_services):
+    """Upload runs extraction, chunking and embedding and marks the document ready."""
+    pdf_service, chunking_service, embedding_service = pipeline_services
+    vector_repo = AsyncMock()
+
+    response = await upload_document(
+        file=make_upload(),
+        session=AsyncMock(),
+        document_repo=document_repo,
+        vector_repo=vector_repo,
+        pdf_service=pdf_service,
+        chunking_service=chunking_service,
+        embedding_service=embedding_service,
+        semantic_cache=Mock(),
+        settings=SETTINGS,
+    )
+
+    assert response.status == DocumentStatus.ready.value
+    assert response.total_pages == 2
+    assert response.total_chunks == 2
+    assert response.file_size == len(b"%PDF-1.4 test")
+    pdf_service.iter_pages.assert_called_once()
+    embedding_service.embed_batch.assert_awaited_once_with(["Texto uno", "Texto dos"])
+
+    vector_repo.create_chunks_bulk.assert_awaited_once()
+    chunks = vector_repo.create_chunks_bulk.await_args.args[0]
+    assert [chunk.page_number for chunk in chunks] == [1, 2]
+    assert chunks[1].embedding == [0.3, 0.4]
+    vector_repo.create_chunk.assert_not_awaited()
+    vector_repo.analyze_chunks.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_upload_document_rejects_invalid_extension(document_repo, pipeline_services):
+    """Non-PDF uploads are rejected before any processing."""
+    pdf_service, chunking_service, embedding_service = pipeline_services
+
+    with pytest.raises(HTTPException) as exc_info:
+        await upload_document(
+            file=make_upload(filename="notes.txt"),
+            session=AsyncMock(),
+            document_repo=document_repo,
+            vector_repo=AsyncMock(),
+            pdf_service=pdf_service,
+            chunking_service=chunking_service,
+            embedding_service=embedding_service,
+            semantic_cache=Mock(),
+            settings=SETTINGS,
+        )
+
+    assert exc_info.value.status_code == 400
+    document_repo.create.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_upload_document_marks_failed_on_processing_error(document_repo, pipeline_services):
+    """Processing errors mark the document as failed and return 422."""
+    pdf_service, chunking_service, embedding_service = pipeline_services
+    embedding_service.embed_batch.side_effect = Exception("API Error")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await upload_document(
+            file=make_upload(),
+            session=AsyncMock(),
+            document_repo=document_repo,
+            vector_repo=AsyncMock(),
+            pdf_service=pdf_service,
+            chunking_service=chunking_service,
+            embedding_service=embedding_service,
+            semantic_cache=Mock(),
+            settings=SETTINGS,
+        )
+
+    assert exc_info.value.status_code == 422
+    document_repo.update_status.assert_awaited_once()
+    assert document_repo.update_status.await_args.args[1] == DocumentStatus.failed
+
+
+@pytest.mark.asyncio
+async def test_upload_document_rejects_oversized_stream(document_repo, pipeline_services):
+    """Uploads over the configured size limit are rejected while streaming, before any DB write."""
+    pdf_service, chunking_service, embedding_service = pipeline_services
+    with pytest.raises(HTTPException) as exc_info:
+        await upload_document(
+            file=make_upload(),
+            session=AsyncMock(),
+            document_repo=document_repo,
+            vector_repo=AsyncMock(),
+            pdf_service=pdf_service,
+            chunking_service=chunking_service,
+            embedding_service=embedding_service,
+            semantic_cache=Mock(),
+            settings=SimpleNamespace(max_file_size_mb=0),
+        )
+
+    assert exc_info.value.status_code == 413
+    document_repo.create.assert_not_awaited()
+    pdf_service.iter_pages.assert_not_called()
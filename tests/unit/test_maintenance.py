@@ -0,0 +1,43 @@
+"""Tests for maintenance commands."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src import maintenance
+from src.repositories.vector_index_config import HNSWParams
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    """Replace the vector repository built by the maintenance command."""
+    repo = AsyncMock()
+    repo.rebuild_index.return_value = HNSWParams(m=24, ef_construction=128, ef_search=100)
+
+    @asynccontextmanager
+    async def session():
+        yield AsyncMock()
+
+    monkeypatch.setattr(maintenance, "get_session_factory", lambda: session)
+    monkeypatch.setattr(maintenance, "VectorRepository", lambda session: repo)
+    return repo
+
+
+@pytest.mark.parametrize(
+    "needs_rebuild,force,rebuilt",
+    [
+        pytest.param(False, False, False, id="up_to_date"),
+        pytest.param(True, False, True, id="tier_changed"),
+        pytest.param(False, True, True, id="forced"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_rebuild_vector_index_only_when_needed(repo, needs_rebuild, force, rebuilt):
+    """The index is rebuilt when its tier changed or when forced."""
+    repo.index_needs_rebuild.return_value = needs_rebuild
+
+    params = await maintenance.rebuild_vector_index(force=force)
+
+    assert (params is not None) is rebuilt
+    assert repo.rebuild_index.await_count == int(rebuilt)
@@ -1,60 +1,66 @@
 """Tests for Chunk model."""
 
-from uuid import UUID, uuid4
+from uuid import UUID
+
+import pytest
 
 from src.models.chunk import Chunk
 
+DOC_ID = UUID(int=0x1234)
+EMBEDDING_1536 = [0.1] * 1536
 
-def test_chunk_model_instantiation():
-    """Test that Chunk model can be instantiated."""
-    doc_id = uuid4()
-    chunk = Chunk(
-        document_id=doc_id,
+
+@pytest.fixture
+def sample_chunk():
+    """Create a chunk without embedding."""
+    return Chunk(
+        document_id=DOC_ID,
         content="This is a test chunk of text.",
         page_number=1,
         chunk_index=0,
         word_count=7,
     )
 
-    assert chunk.document_id == doc_id
-    assert chunk.content == "This is a test chunk of text."
-    assert chunk.page_number == 1
-    assert chunk.chunk_index == 0
-    assert chunk.word_count == 7
-    assert chunk.embedding is None
+
+def test_chunk_model_instantiation(sample_chunk):
+    """Test that Chunk model can be instantiated."""
+    assert sample_chunk.document_id == DOC_ID
+    assert sample_chunk.content == "This is a test chunk of text."
+    assert sample_chunk.page_number == 1
+    assert sample_chunk.chunk_index == 0
+    assert sample_chunk.word_count == 7
+    assert sample_chunk.embedding is None
 
 
 def test_chunk_with_embedding():
     """Test Chunk with embedding vector."""
-    doc_id = uuid4()
-    embedding = [0.1] * 1536  # 1536-dimensional vector
-
     chunk = Chunk(
-        document_id=doc_id,
+        document_id=DOC_ID,
         content="Test content",
-        embedding=embedding,
+        embedding=EMBEDDING_1536,
         page_number=1,
         chunk_index=0,
         word_count=2,
     )
 
-    assert chunk.embedding == embedding
+    assert chunk.embedding == EMBEDDING_1536
     assert len(chunk.embedding) == 1536
 
 
-def test_chunk_repr():
+def test_chunk_repr(sample_chunk):
     """Test Chunk __repr__ method."""
-    doc_id = UUID("12345678-1234-5678-1234-567812345678")
-    chunk = Chunk(
-        document_id=doc_id,
-        content="Test",
-        page_number=5,
-        chunk_index=2,
-        word_count=1,
-    )
-    chunk.id = UUID("87654321-4321-8765-4321-876543218765")
+    sample_chunk.id = UUID("87654321-4321-8765-4321-876543218765")
 
-    repr_str = repr(chunk)
+    repr_str = repr(sample_chunk)
     assert "Chunk" in repr_str
     assert "87654321-4321-8765-4321-876543218765" in repr_str
-    assert "page=5" in repr_str
+    assert "page=1" in repr_str
+
+
+def test_chunk_embedding_index_uses_hnsw():
+    """Test that the embedding index is an HNSW inner-product index."""
+    index = next(i for i in Chunk.__table__.indexes if i.name == "ix_chunks_embedding")
+
+    assert index.dialect_options["postgresql"]["using"] == "hnsw"
+    assert index.dialect_options["postgresql"]["ops"] == {"embedding": "halfvec_ip_ops"}
+    assert index.dialect_options["postgresql"]["with"] == {"m": 16, "ef_construction": 64}
@@ -0,0 +1,90 @@
+"""Tests for document repository."""
+
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.sql.dml import Update
+
+from src.models.document import Document, DocumentStatus
+from src.repositories.document_repo import DocumentRepository
+
+
+@pytest.mark.asyncio
+async def test_update_status_issues_single_update_returning():
+    """Status changes are one UPDATE ... RETURNING without a prior SELECT."""
+    document = Document(id=uuid4(), filename="test.pdf", file_size=10)
+    session = AsyncMock()
+    result = Mock()
+    result.scalar_one_or_none.return_value = document
+    session.execute.return_value = result
+
+    updated = await DocumentRepository(session).update_status(
+        document.id, DocumentStatus.failed, error_message="Error"
+    )
+
+    assert updated is document
+    session.execute.assert_awaited_once()
+    statement = session.execute.await_args.args[0]
+    assert isinstance(statement, Update)
+    assert statement._returning
+    columns = Document.__table__.c
+    assert set(statement._values) == {columns.status, columns.error_message}
+    session.commit.assert_awaited_once()
+    session.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_status_keeps_error_message_when_not_given():
+    """Only the status column is written when no error message is passed."""
+    session = AsyncMock()
+    session.execute.return_value = Mock(scalar_one_or_none=Mock(return_value=None))
+
+    updated = await DocumentRepository(session).update_status(uuid4(), DocumentStatus.ready)
+
+    assert updated is None
+    statement = session.execute.await_args.args[0]
+    assert set(statement._values) == {Document.__table__.c.status}
+
+
+@pytest.mark.asyncio
+async def test_list_all_applies_loader_options():
+    """Loader options narrow the SELECT to the requested columns."""
+    from sqlalchemy.orm import load_only
+
+    session = AsyncMock()
+    session.execute.return_value = Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[]))))
+
+    await DocumentRepository(session).list_all(5, load_only(Document.id, Document.filename))
+
+    sql = str(session.execute.await_args.args[0])
+    assert "documents.filename" in sql
+    assert "documents.doc_metadata" not in sql
+
+
+@pytest.mark.asyncio
+async def test_create_skips_refresh_for_client_side_defaults():
+    """Entities whose columns are all populated client-side are not re-selected."""
+    session = AsyncMock()
+    session.add = Mock()
+    document = Document(id=uuid4(), filename="test.pdf", file_size=10)
+
+    await DocumentRepository(session).create(document)
+
+    session.commit.assert_awaited_once()
+    session.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_refreshes_expired_server_columns(monkeypatch):
+    """Columns the server generated (left expired by the flush) are reloaded."""
+    session = AsyncMock()
+    session.add = Mock()
+    document = Document(id=uuid4(), filename="test.pdf", file_size=10)
+    monkeypatch.setattr(
+        "src.repositories.base.inspect", lambda entity: Mock(expired_attributes={"upload_date"})
+    )
+
+    await DocumentRepository(session).create(document)
+
+    session.refresh.assert_awaited_once_with(document)
@@ -0,0 +1,19 @@
+"""Tests for HNSW parameter tiers."""
+
+import pytest
+
+from src.repositories.vector_index_config import HNSWParams, configure_hnsw_params
+
+
+@pytest.mark.parametrize(
+    ("vector_count", "expected"),
+    [
+        (0, HNSWParams(m=16, ef_construction=64, ef_search=40)),
+        (99_999, HNSWParams(m=16, ef_construction=64, ef_search=40)),
+        (100_000, HNSWParams(m=24, ef_construction=128, ef_search=100)),
+        (1_000_000, HNSWParams(m=32, ef_construction=200, ef_search=200)),
+    ],
+)
+def test_configure_hnsw_params_picks_tier(vector_count, expected):
+    """Parameters grow with the size of the corpus."""
+    assert configure_hnsw_params(vector_count) == expected
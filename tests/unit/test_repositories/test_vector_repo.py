@@ -0,0 +1,196 @@
+"""Tests for vector repository."""
+
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+
+from src.models.chunk import Chunk
+from src.repositories.vector_repo import (
+    COPY_THRESHOLD,
+    VectorRepository,
+    _decode_halfvec,
+    _encode_halfvec,
+)
+
+
+@pytest.fixture
+def session():
+    """Create mock async session."""
+    session = AsyncMock()
+    session.add_all = Mock()
+    return session
+
+
+def make_chunks(count: int) -> list[Chunk]:
+    """Build unsaved chunks for a single document."""
+    doc_id = uuid4()
+    return [
+        Chunk(
+            document_id=doc_id,
+            content=f"Fragmento {i}",
+            page_number=1,
+            chunk_index=i,
+            word_count=2,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_chunks_bulk_issues_single_executemany_insert(session):
+    """Small batches are one Core INSERT with a parameter list, not per-chunk writes."""
+    from sqlalchemy.sql.dml import Insert
+
+    chunks = make_chunks(3)
+
+    result = await VectorRepository(session).create_chunks_bulk(chunks)
+
+    assert result == chunks
+    session.execute.assert_awaited_once()
+    statement, rows = session.execute.await_args.args
+    assert isinstance(statement, Insert)
+    assert [row["content"] for row in rows] == [c.content for c in chunks]
+    assert all(row["id"] is not None and row["created_at"] is not None for row in rows)
+    session.add_all.assert_not_called()
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_chunks_bulk_skips_commit_when_requested(session):
+    """commit=False leaves the transaction open for the caller."""
+    await VectorRepository(session).create_chunks_bulk(make_chunks(2), commit=False)
+
+    session.execute.assert_awaited_once()
+    session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_chunks_bulk_uses_binary_copy_for_large_batches(session):
+    """Batches above the threshold are streamed with COPY on the raw asyncpg connection."""
+    driver_connection = AsyncMock()
+    raw_connection = Mock(driver_connection=driver_connection)
+    connection = Mock(get_raw_connection=AsyncMock(return_value=raw_connection))
+    session.connection.return_value = connection
+    chunks = make_chunks(COPY_THRESHOLD + 1)
+
+    await VectorRepository(session).create_chunks_bulk(chunks)
+
+    session.add_all.assert_not_called()
+    driver_connection.copy_records_to_table.assert_awaited_once()
+    kwargs = driver_connection.copy_records_to_table.await_args.kwargs
+    assert len(kwargs["records"]) == len(chunks)
+    assert all(chunk.id is not None and chunk.created_at is not None for chunk in chunks)
+    driver_connection.reset_type_codec.assert_awaited_once_with("halfvec")
+    session.commit.assert_awaited_once()
+
+
+def test_halfvec_binary_codec_round_trip():
+    """Half-precision vectors survive pgvector's binary wire format."""
+    encoded = _encode_halfvec([0.5, -1.0, 2.0])
+
+    assert encoded[:4] == b"\x00\x03\x00\x00"
+    assert _decode_halfvec(encoded) == [0.5, -1.0, 2.0]
+
+
+@pytest.mark.parametrize(
+    "chunk_count,index_row,expected",
+    [
+        pytest.param(5_000, (None,), False, id="defaults_match_small_tier"),
+        pytest.param(250_000, (None,), True, id="defaults_behind_medium_tier"),
+        pytest.param(250_000, (["m=24", "ef_construction=128"],), False, id="tuned_matches"),
+        pytest.param(5_000, None, True, id="missing_index"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_index_needs_rebuild_compares_build_options(
+    session, chunk_count, index_row, expected
+):
+    """A rebuild is needed only when the stored m/ef_construction miss the size tier."""
+    count_result = Mock()
+    count_result.scalar_one.return_value = chunk_count
+    options_result = Mock()
+    options_result.first.return_value = index_row
+    session.execute.side_effect = [count_result, options_result]
+
+    assert await VectorRepository(session).index_needs_rebuild() is expected
+
+
+@pytest.mark.asyncio
+async def test_rebuild_index_uses_tuned_params(session, monkeypatch):
+    """The index is recreated with parameters for the current chunk count."""
+    from src.repositories import vector_repo
+
+    monkeypatch.setattr(vector_repo, "_tuned_hnsw_params", None)
+    count_result = Mock()
+    count_result.scalar_one.return_value = 250_000
+    session.execute.return_value = count_result
+
+    params = await VectorRepository(session).rebuild_index()
+
+    assert (params.m, params.ef_construction) == (24, 128)
+    create_sql = str(session.execute.await_args_list[-1].args[0])
+    assert "USING hnsw (embedding halfvec_ip_ops)" in create_sql
+    assert "WITH (m = 24, ef_construction = 128)" in create_sql
+    assert vector_repo._tuned_hnsw_params == params
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_similarity_search_runs_on_async_session(session):
+    """Vector search goes through the AsyncSession instead of a sync driver."""
+    chunk = make_chunks(1)[0]
+    rows = Mock()
+    rows.all.return_value = [(chunk, 0.82)]
+    session.execute.side_effect = [Mock(), rows]
+
+    results = await VectorRepository(session, ef_search=40).similarity_search(
+        [0.5, 0.25], top_k=3, min_score=0.4, document_id=chunk.document_id
+    )
+
+    assert results == [(chunk, 0.82)]
+    ef_statement, ef_params = session.execute.await_args_list[0].args
+    assert "set_config('hnsw.ef_search'" in str(ef_statement)
+    assert ef_params == {"ef_search": "40"}
+
+    search_sql = str(session.execute.await_args_list[1].args[0])
+    assert "chunks.embedding <#>" in search_sql
+    assert "chunks.document_id =" in search_sql
+    assert "LIMIT" in search_sql
+    assert session.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_similarity_search_disables_seqscan_for_unfiltered_queries(session):
+    """The pure ANN query runs with seq scans off, restored afterwards."""
+    rows = Mock()
+    rows.all.return_value = []
+    session.execute.side_effect = [Mock(), Mock(), rows, Mock()]
+
+    await VectorRepository(session, ef_search=40).similarity_search([0.5, 0.25])
+
+    calls = session.execute.await_args_list
+    assert "set_config('enable_seqscan'" in str(calls[1].args[0])
+    assert calls[1].args[1] == {"value": "off"}
+    assert "chunks.embedding <#>" in str(calls[2].args[0])
+    assert calls[3].args[1] == {"value": "on"}
+
+
+@pytest.mark.asyncio
+async def test_similarity_search_failure_is_not_masked_by_seqscan_restore(session):
+    """A failed search surfaces its own error; the aborted transaction resets seq scans."""
+    session.execute.side_effect = [Mock(), Mock(), RuntimeError("search failed")]
+
+    with pytest.raises(RuntimeError, match="search failed"):
+        await VectorRepository(session, ef_search=40).similarity_search([0.5, 0.25])
+
+    assert session.execute.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_analyze_chunks_refreshes_statistics(session):
+    """ANALYZE runs on the chunks table and is committed."""
+    await VectorRepository(session).analyze_chunks()
+
+    assert str(session.execute.await_args.args[0]) == "ANALYZE chunks"
+    session.commit.assert_awaited_once()
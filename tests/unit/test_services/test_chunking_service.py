@@ -3,9 +3,15 @@
 import pytest
 
 from src.services.chunking_service import ChunkingService
+from src.utils.text_processing import count_tokens
 
+# Repetitive corpora shared by the splitting tests, built once at import
+LONG_TEXT = " ".join(["palabra"] * 500)
+MEDIUM_TEXT = " ".join(["test"] * 200)
+ACCENTED_TEXT = " ".join(["información"] * 400)
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def chunking_service():
     """Create ChunkingService instance."""
     return ChunkingService(chunk_size=100, chunk_overlap=20)
@@ -98,9 +104,7 @@ def test_chunk_cleans_text(chunking_service):
 
 def test_chunk_long_text_splits(chunking_service):
     """Test that long text is split into multiple chunks."""
-    # Create a long text
-    long_text = " ".join(["palabra"] * 500)
-    pages_dict = {1: long_text}
+    pages_dict = {1: LONG_TEXT}
 
     chunks = chunking_service.chunk_text(pages_dict)
 
@@ -112,7 +116,7 @@ def test_chunk_custom_size():
     """Test chunking with custom size parameters."""
     service = ChunkingService(chunk_size=50, chunk_overlap=10)
 
-    pages_dict = {1: " ".join(["test"] * 200)}
+    pages_dict = {1: MEDIUM_TEXT}
 
     chunks = service.chunk_text(pages_dict)
 
@@ -120,6 +124,15 @@ def test_chunk_custom_size():
     assert len(chunks) > 2
 
 
+def test_chunk_size_is_measured_in_tokens(chunking_service):
+    """No chunk exceeds chunk_size tokens."""
+    pages_dict = {1: ACCENTED_TEXT}
+
+    chunks = chunking_service.chunk_text(pages_dict)
+
+    assert all(count_tokens(chunk["content"]) <= 100 for chunk in chunks)
+
+
 def test_chunk_spanish_text(chunking_service):
     """Test chunking with Spanish text."""
     pages_dict = {
@@ -136,3 +149,12 @@ def test_chunk_spanish_text(chunking_service):
     # Spanish characters should be preserved
     combined_text = " ".join(chunk["content"] for chunk in chunks)
     assert "ñ" in combined_text or "á" in combined_text
+
+
+def test_chunk_accepts_streamed_pages(chunking_service):
+    """Test that (page, text) pairs chunk the same as the equivalent dict."""
+    pages_dict = {1: "Primera página.", 2: "Segunda página."}
+
+    assert chunking_service.chunk_text(iter(pages_dict.items())) == (
+        chunking_service.chunk_text(pages_dict)
+    )
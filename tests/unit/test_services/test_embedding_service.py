@@ -1,6 +1,8 @@
 """Tests for embedding service."""
 
-from unittest.mock import MagicMock, Mock, patch
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
@@ -8,146 +10,304 @@ from src.services.embedding_service import EmbeddingService
 from src.utils.exceptions import EmbeddingServiceError
 
 
+def make_embed_response(vectors):
+    """Build an embeddings API response holding the given vectors."""
+    return SimpleNamespace(data=[SimpleNamespace(embedding=vector) for vector in vectors])
+
+
 @pytest.fixture
 def mock_openai_client():
     """Create mock OpenAI client."""
-    with patch("src.services.embedding_service.OpenAI") as mock_client_class:
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        yield mock_client
+    mock_client = Mock()
+    mock_client.embeddings.create = AsyncMock()
+    return mock_client
 
 
 @pytest.fixture
 def embedding_service(mock_openai_client):
     """Create EmbeddingService with mocked OpenAI client."""
-    return EmbeddingService(api_key="test-key", base_url="https://openrouter.ai/api/v1", model="text-embedding-3-small")
+    return EmbeddingService(client=mock_openai_client, model="text-embedding-3-small")
 
 
-def test_embed_text_returns_vector(embedding_service, mock_openai_client):
+@pytest.mark.asyncio
+async def test_embed_text_returns_vector(embedding_service, mock_openai_client):
     """Test that embed_text returns a vector."""
     # Mock response
-    mock_response = Mock()
-    mock_response.data = [Mock(embedding=[0.1, 0.2, 0.3])]
-    mock_openai_client.embeddings.create.return_value = mock_response
+    mock_openai_client.embeddings.create.return_value = make_embed_response([[0.1, 0.2, 0.3]])
 
-    result = embedding_service.embed_text("test text")
+    result = await embedding_service.embed_text("test text")
 
     assert result == [0.1, 0.2, 0.3]
     assert isinstance(result, list)
-    mock_openai_client.embeddings.create.assert_called_once()
+    mock_openai_client.embeddings.create.assert_awaited_once()
 
 
-def test_embed_text_calls_api_with_correct_params(embedding_service, mock_openai_client):
-    """Test that embed_text calls OpenAI API with correct parameters."""
-    mock_response = Mock()
-    mock_response.data = [Mock(embedding=[0.1])]
-    mock_openai_client.embeddings.create.return_value = mock_response
+@pytest.mark.parametrize("model", ["text-embedding-3-small", "custom-model"])
+@pytest.mark.asyncio
+async def test_embed_text_calls_api_with_service_model(mock_openai_client, model):
+    """Test that embed_text sends the text with the service's model."""
+    mock_openai_client.embeddings.create.return_value = make_embed_response([[0.1]])
+    service = EmbeddingService(client=mock_openai_client, model=model)
 
-    embedding_service.embed_text("Spanish text")
+    await service.embed_text("Spanish text")
 
-    mock_openai_client.embeddings.create.assert_called_once_with(
-        input="Spanish text", model="text-embedding-3-small"
-    )
+    mock_openai_client.embeddings.create.assert_called_once_with(input="Spanish text", model=model)
 
 
-def test_embed_text_raises_error_for_empty_string(embedding_service):
+@pytest.mark.asyncio
+async def test_embed_text_raises_error_for_empty_string(embedding_service):
     """Test that embed_text raises error for empty string."""
     with pytest.raises(EmbeddingServiceError) as exc_info:
-        embedding_service.embed_text("")
+        await embedding_service.embed_text("")
 
     assert "texto vacío" in str(exc_info.value)
 
 
-def test_embed_text_raises_error_on_api_failure(embedding_service, mock_openai_client):
+@pytest.mark.asyncio
+async def test_embed_text_raises_error_on_api_failure(embedding_service, mock_openai_client):
     """Test that embed_text raises error on API failure."""
     mock_openai_client.embeddings.create.side_effect = Exception("API Error")
 
     with pytest.raises(EmbeddingServiceError) as exc_info:
-        embedding_service.embed_text("test")
+        await embedding_service.embed_text("test")
 
     assert "Error al generar embedding" in str(exc_info.value)
 
 
-def test_embed_batch_returns_multiple_vectors(embedding_service, mock_openai_client):
-    """Test that embed_batch returns multiple vectors."""
-    mock_response = Mock()
-    mock_response.data = [
-        Mock(embedding=[0.1, 0.2]),
-        Mock(embedding=[0.3, 0.4]),
-        Mock(embedding=[0.5, 0.6]),
-    ]
-    mock_openai_client.embeddings.create.return_value = mock_response
+def respond_with_positions(input, model):
+    """Embed each input text as its position within the request."""
+    return make_embed_response([float(i)] for i in range(len(input)))
+
+
+@pytest.mark.parametrize(
+    "texts,max_batch_size,expected,expected_calls",
+    [
+        (["text1", "text2", "text3"], 100, [[0.0], [1.0], [2.0]], 1),
+        # Blank texts are dropped before calling the API
+        (["text1", "", "text2", "   "], 100, [[0.0], [1.0]], 1),
+        # 150 texts go out in two requests (100 + 50), results in input order
+        (
+            [f"text{i}" for i in range(150)],
+            100,
+            [[float(i)] for i in range(100)] + [[float(i)] for i in range(50)],
+            2,
+        ),
+    ],
+    ids=["multiple-vectors", "filters-empty-strings", "processes-in-batches"],
+)
+@pytest.mark.asyncio
+async def test_embed_batch(
+    embedding_service, mock_openai_client, texts, max_batch_size, expected, expected_calls
+):
+    """Test that embed_batch returns one vector per non-empty text, batching requests."""
+    mock_openai_client.embeddings.create.side_effect = respond_with_positions
+
+    result = await embedding_service.embed_batch(texts, max_batch_size=max_batch_size)
+
+    assert result == expected
+    assert mock_openai_client.embeddings.create.await_count == expected_calls
+
+
+@pytest.mark.asyncio
+async def test_embed_batch_handles_empty_list(embedding_service):
+    """Test that embed_batch handles empty list."""
+    result = await embedding_service.embed_batch([])
+    assert result == []
 
-    texts = ["text1", "text2", "text3"]
-    result = embedding_service.embed_batch(texts)
 
-    assert len(result) == 3
-    assert result[0] == [0.1, 0.2]
-    assert result[1] == [0.3, 0.4]
-    assert result[2] == [0.5, 0.6]
+@pytest.mark.asyncio
+async def test_embed_batch_raises_error_on_api_failure(embedding_service, mock_openai_client):
+    """Test that embed_batch raises error on API failure."""
+    mock_openai_client.embeddings.create.side_effect = Exception("API Error")
 
+    with pytest.raises(EmbeddingServiceError) as exc_info:
+        await embedding_service.embed_batch(["text1", "text2"])
 
-def test_embed_batch_handles_empty_list(embedding_service):
-    """Test that embed_batch handles empty list."""
-    result = embedding_service.embed_batch([])
-    assert result == []
+    assert "Error al generar embeddings en batch" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_embed_batch_caps_concurrent_requests(mock_openai_client):
+    """Test that embed_batch runs batches in parallel up to max_concurrency."""
+    in_flight = 0
+    peak = 0
+
+    async def create_mock_response(input, model):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return make_embed_response([float(len(text))] for text in input)
+
+    mock_openai_client.embeddings.create.side_effect = create_mock_response
+    service = EmbeddingService(client=mock_openai_client, max_concurrency=2)
+
+    texts = ["a" * (i + 1) for i in range(10)]
+    result = await service.embed_batch(texts, max_batch_size=2)
+
+    assert mock_openai_client.embeddings.create.await_count == 5
+    assert peak == 2
+    # Results keep input order across batches
+    assert result == [[float(i + 1)] for i in range(10)]
 
 
-def test_embed_batch_filters_empty_strings(embedding_service, mock_openai_client):
-    """Test that embed_batch filters out empty strings."""
-    mock_response = Mock()
-    mock_response.data = [Mock(embedding=[0.1]), Mock(embedding=[0.2])]
-    mock_openai_client.embeddings.create.return_value = mock_response
+@pytest.mark.asyncio
+async def test_embed_text_uses_cache_for_repeated_text(embedding_service, mock_openai_client):
+    """Test that repeated texts are served from the cache."""
+    mock_openai_client.embeddings.create.return_value = make_embed_response([[0.1, 0.2]])
 
-    texts = ["text1", "", "text2", "   "]
-    result = embedding_service.embed_batch(texts)
+    first = await embedding_service.embed_text("¿Qué es RAG?")
+    second = await embedding_service.embed_text("¿Qué es RAG?")
 
-    # Should only process non-empty texts
-    assert len(result) == 2
-    mock_openai_client.embeddings.create.assert_called_once()
+    assert first == second == [0.1, 0.2]
+    mock_openai_client.embeddings.create.assert_awaited_once()
 
 
-def test_embed_batch_processes_in_batches(embedding_service, mock_openai_client):
-    """Test that embed_batch processes large lists in batches."""
-    # Mock to return correct number of embeddings per batch
+@pytest.mark.asyncio
+async def test_embed_batch_only_sends_uncached_texts(embedding_service, mock_openai_client):
+    """Test that embed_batch skips cached and duplicated texts."""
+
     def create_mock_response(input, model):
-        mock_response = Mock()
-        mock_response.data = [Mock(embedding=[float(i)]) for i in range(len(input))]
-        return mock_response
+        return make_embed_response([float(len(text))] for text in input)
 
     mock_openai_client.embeddings.create.side_effect = create_mock_response
 
-    # Create 150 texts, should be processed in 2 batches (100 + 50)
-    texts = [f"text{i}" for i in range(150)]
-    result = embedding_service.embed_batch(texts, max_batch_size=100)
+    await embedding_service.embed_batch(["aa"])
+    result = await embedding_service.embed_batch(["aa", "bbb", "bbb", "c"])
 
-    # Should make 2 API calls
-    assert mock_openai_client.embeddings.create.call_count == 2
-    assert len(result) == 150
+    assert result == [[2.0], [3.0], [3.0], [1.0]]
+    last_call = mock_openai_client.embeddings.create.await_args
+    assert last_call.kwargs["input"] == ["bbb", "c"]
 
 
-def test_embed_batch_raises_error_on_api_failure(embedding_service, mock_openai_client):
-    """Test that embed_batch raises error on API failure."""
-    mock_openai_client.embeddings.create.side_effect = Exception("API Error")
+@pytest.mark.asyncio
+async def test_embedding_service_uses_injected_client():
+    """A shared client passed at construction is used instead of building a new one."""
+    shared_client = Mock()
+    shared_client.embeddings.create = AsyncMock()
+    shared_client.embeddings.create.return_value = make_embed_response([[0.5]])
 
-    with pytest.raises(EmbeddingServiceError) as exc_info:
-        embedding_service.embed_batch(["text1", "text2"])
+    with patch("src.services.embedding_service.AsyncOpenAI") as mock_client_class:
+        service = EmbeddingService(client=shared_client)
 
-    assert "Error al generar embeddings en batch" in str(exc_info.value)
+    assert service.client is shared_client
+    mock_client_class.assert_not_called()
+    assert await service.embed_text("hola") == [0.5]
+
+
+@pytest.mark.asyncio
+async def test_embed_batch_caches_successful_batches_on_partial_failure(
+    embedding_service, mock_openai_client
+):
+    """A failed batch does not throw away the batches that succeeded."""
+
+    def create_mock_response(input, model):
+        if input[0] == "b":
+            raise Exception("API Error")
+        return make_embed_response([1.0] for _ in input)
+
+    mock_openai_client.embeddings.create.side_effect = create_mock_response
+
+    with pytest.raises(EmbeddingServiceError):
+        await embedding_service.embed_batch(["a", "b"], max_batch_size=1)
+
+    mock_openai_client.embeddings.create.reset_mock(side_effect=True)
+    mock_openai_client.embeddings.create.return_value = make_embed_response([[2.0]])
+
+    result = await embedding_service.embed_batch(["a", "b"], max_batch_size=1)
+
+    assert result == [[1.0], [2.0]]
+    mock_openai_client.embeddings.create.assert_awaited_once_with(
+        input=["b"], model="text-embedding-3-small"
+    )
+
+
+@pytest.mark.asyncio
+async def test_embed_text_coalesces_concurrent_identical_queries(
+    embedding_service, mock_openai_client
+):
+    """Concurrent misses for the same (whitespace-trimmed) text share one API call."""
+    release = asyncio.Event()
+
+    async def slow_create(input, model):
+        await release.wait()
+        return make_embed_response([[0.7]])
+
+    mock_openai_client.embeddings.create.side_effect = slow_create
+
+    tasks = [
+        asyncio.create_task(embedding_service.embed_text(text))
+        for text in ("¿Qué es RAG?", "  ¿Qué es RAG?  ", "¿Qué es RAG?")
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == [[0.7], [0.7], [0.7]]
+    mock_openai_client.embeddings.create.assert_awaited_once_with(
+        input="¿Qué es RAG?", model="text-embedding-3-small"
+    )
+
+
+@pytest.mark.asyncio
+async def test_embed_text_failure_is_shared_and_not_cached(embedding_service, mock_openai_client):
+    """A failed fetch raises for every waiter and the next call retries."""
+
+    async def failing_create(input, model):
+        await asyncio.sleep(0)
+        raise Exception("API Error")
+
+    mock_openai_client.embeddings.create.side_effect = failing_create
+
+    results = await asyncio.gather(
+        embedding_service.embed_text("hola"),
+        embedding_service.embed_text("hola"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, EmbeddingServiceError) for result in results)
+    assert mock_openai_client.embeddings.create.await_count == 1
+
+    mock_openai_client.embeddings.create.side_effect = None
+    mock_openai_client.embeddings.create.return_value = make_embed_response([[0.1]])
+    assert await embedding_service.embed_text("hola") == [0.1]
+
+
+@pytest.mark.asyncio
+async def test_embeddings_from_other_models_are_normalized(mock_openai_client):
+    """Non unit-norm providers are scaled so inner product equals cosine."""
+    mock_openai_client.embeddings.create.return_value = make_embed_response([[3.0, 4.0]])
+    service = EmbeddingService(client=mock_openai_client, model="other/embedder")
+
+    result = await service.embed_text("hola")
+
+    assert result == pytest.approx([0.6, 0.8])
+
+
+def test_openai_models_skip_normalization():
+    """OpenAI embeddings are already unit length and are passed through."""
+    assert EmbeddingService(client=Mock(), model="openai/text-embedding-3-small").normalize is False
+
+
+@pytest.mark.asyncio
+async def test_embed_text_cancelled_owner_fails_waiters_with_service_error(
+    embedding_service, mock_openai_client
+):
+    """Cancelling the caller that issued the fetch gives other waiters an EmbeddingServiceError."""
 
+    async def slow_create(input, model):
+        await asyncio.Event().wait()
 
-def test_embedding_service_uses_custom_model():
-    """Test that EmbeddingService can use custom model."""
-    with patch("src.services.embedding_service.OpenAI") as mock_client_class:
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        mock_response = Mock()
-        mock_response.data = [Mock(embedding=[0.1])]
-        mock_client.embeddings.create.return_value = mock_response
+    mock_openai_client.embeddings.create.side_effect = slow_create
 
-        service = EmbeddingService(api_key="test", base_url="https://openrouter.ai/api/v1", model="custom-model")
-        service.embed_text("test")
+    owner = asyncio.create_task(embedding_service.embed_text("hola"))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(embedding_service.embed_text("hola"))
+    await asyncio.sleep(0)
+    owner.cancel()
 
-        mock_client.embeddings.create.assert_called_with(
-            input="test", model="custom-model"
-        )
+    with pytest.raises(asyncio.CancelledError):
+        await owner
+    with pytest.raises(EmbeddingServiceError):
+        await waiter
+    assert embedding_service._pending == {}
@@ -1,129 +1,211 @@
 """Tests for LLM service."""
 
-from unittest.mock import Mock, patch
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
 from src.services.llm_service import LLMService
 from src.utils.exceptions import LLMServiceError
 
+LONG_RESPONSE = "Esta es una respuesta muy larga. " * 100
+
+
+def make_chat_response(text, total_tokens):
+    """Build a chat completion response with one choice and its token usage."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+        usage=SimpleNamespace(total_tokens=total_tokens),
+    )
+
 
 @pytest.fixture
 def mock_openai_client():
-    """Create mock OpenAI client."""
-    with patch("src.services.llm_service.OpenAI") as mock_client_class:
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        yield mock_client
+    """Create mock AsyncOpenAI client."""
+    mock_client = Mock()
+    mock_client.chat.completions.create = AsyncMock()
+    return mock_client
 
 
 @pytest.fixture
 def llm_service(mock_openai_client):
-    """Create LLMService with mocked OpenAI client."""
-    return LLMService(api_key="test-key", base_url="https://openrouter.ai/api/v1", model="~openai/gpt-latest")
+    """Create LLMService with mocked AsyncOpenAI client."""
+    return LLMService(model="~openai/gpt-latest", client=mock_openai_client)
 
 
-def test_generate_answer_returns_text_and_tokens(llm_service, mock_openai_client):
+@pytest.mark.asyncio
+async def test_generate_answer_returns_text_and_tokens(llm_service, mock_openai_client):
     """Test that generate_answer returns response text and token count."""
     # Mock response
-    mock_response = Mock()
-    mock_response.choices = [Mock(message=Mock(content="Esta es la respuesta"))]
-    mock_response.usage = Mock(total_tokens=150)
-    mock_openai_client.chat.completions.create.return_value = mock_response
+    mock_openai_client.chat.completions.create.return_value = make_chat_response(
+        "Esta es la respuesta", 150
+    )
 
-    text, tokens = llm_service.generate_answer("Test prompt")
+    text, tokens = await llm_service.generate_answer("Test prompt")
 
     assert text == "Esta es la respuesta"
     assert tokens == 150
 
 
-def test_generate_answer_calls_api_with_correct_params(llm_service, mock_openai_client):
-    """Test that generate_answer calls OpenAI API with correct parameters."""
-    mock_response = Mock()
-    mock_response.choices = [Mock(message=Mock(content="Respuesta"))]
-    mock_response.usage = Mock(total_tokens=100)
-    mock_openai_client.chat.completions.create.return_value = mock_response
-
-    llm_service.generate_answer("Test prompt")
-
-    mock_openai_client.chat.completions.create.assert_called_once_with(
-        model="~openai/gpt-latest",
-        messages=[{"role": "user", "content": "Test prompt"}],
-        temperature=0.1,
-        max_tokens=1000,
+@pytest.mark.parametrize(
+    "service_kwargs,expected_kwargs",
+    [
+        (
+            {"model": "~openai/gpt-latest"},
+            {"model": "~openai/gpt-latest", "temperature": 0.1, "max_tokens": 1000},
+        ),
+        (
+            {"model": "openai/gpt-chat-latest", "temperature": 0.5, "max_tokens": 500},
+            {"model": "openai/gpt-chat-latest", "temperature": 0.5, "max_tokens": 500},
+        ),
+    ],
+    ids=["defaults", "custom"],
+)
+@pytest.mark.asyncio
+async def test_generate_answer_calls_api_with_service_parameters(
+    mock_openai_client, service_kwargs, expected_kwargs
+):
+    """Test that generate_answer sends the prompt with the service's model settings."""
+    mock_openai_client.chat.completions.create.return_value = make_chat_response("Respuesta", 100)
+    service = LLMService(**service_kwargs, client=mock_openai_client)
+
+    await service.generate_answer("Test prompt")
+
+    mock_openai_client.chat.completions.create.assert_awaited_once_with(
+        messages=[{"role": "user", "content": "Test prompt"}], **expected_kwargs
     )
 
 
-def test_generate_answer_raises_error_for_empty_prompt(llm_service):
+@pytest.mark.asyncio
+async def test_generate_answer_raises_error_for_empty_prompt(llm_service):
     """Test that generate_answer raises error for empty prompt."""
     with pytest.raises(LLMServiceError) as exc_info:
-        llm_service.generate_answer("")
+        await llm_service.generate_answer("")
 
     assert "prompt vacío" in str(exc_info.value)
 
 
-def test_generate_answer_raises_error_on_api_failure(llm_service, mock_openai_client):
+@pytest.mark.asyncio
+async def test_generate_answer_raises_error_on_api_failure(llm_service, mock_openai_client):
     """Test that generate_answer raises error on API failure."""
     mock_openai_client.chat.completions.create.side_effect = Exception("API Error")
 
     with pytest.raises(LLMServiceError) as exc_info:
-        llm_service.generate_answer("test prompt")
+        await llm_service.generate_answer("test prompt")
 
     assert "Error al generar respuesta del LLM" in str(exc_info.value)
 
 
-def test_generate_answer_with_spanish_prompt(llm_service, mock_openai_client):
+@pytest.mark.asyncio
+async def test_generate_answer_with_spanish_prompt(llm_service, mock_openai_client):
     """Test generate_answer with Spanish prompt."""
-    mock_response = Mock()
-    mock_response.choices = [
-        Mock(message=Mock(content="El objetivo es desarrollar un sistema RAG"))
-    ]
-    mock_response.usage = Mock(total_tokens=200)
-    mock_openai_client.chat.completions.create.return_value = mock_response
+    mock_openai_client.chat.completions.create.return_value = make_chat_response(
+        "El objetivo es desarrollar un sistema RAG", 200
+    )
 
     prompt = "¿Cuál es el objetivo del proyecto?"
-    text, tokens = llm_service.generate_answer(prompt)
+    text, tokens = await llm_service.generate_answer(prompt)
 
     assert "RAG" in text
     assert tokens > 0
 
 
-def test_llm_service_uses_custom_parameters():
-    """Test that LLMService can use custom parameters."""
-    with patch("src.services.llm_service.OpenAI") as mock_client_class:
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content="Test"))]
-        mock_response.usage = Mock(total_tokens=50)
-        mock_client.chat.completions.create.return_value = mock_response
-
-        service = LLMService(
-            api_key="test",
-            base_url="https://openrouter.ai/api/v1",
-            model="openai/gpt-chat-latest",
-            temperature=0.5,
-            max_tokens=500,
-        )
-        service.generate_answer("test")
-
-        mock_client.chat.completions.create.assert_called_with(
-            model="openai/gpt-chat-latest",
-            messages=[{"role": "user", "content": "test"}],
-            temperature=0.5,
-            max_tokens=500,
-        )
-
-
-def test_generate_answer_handles_long_response(llm_service, mock_openai_client):
+@pytest.mark.asyncio
+async def test_generate_answer_handles_long_response(llm_service, mock_openai_client):
     """Test that generate_answer handles long responses."""
-    long_response = "Esta es una respuesta muy larga. " * 100
-    mock_response = Mock()
-    mock_response.choices = [Mock(message=Mock(content=long_response))]
-    mock_response.usage = Mock(total_tokens=500)
-    mock_openai_client.chat.completions.create.return_value = mock_response
+    mock_openai_client.chat.completions.create.return_value = make_chat_response(LONG_RESPONSE, 500)
 
-    text, tokens = llm_service.generate_answer("prompt")
+    text, tokens = await llm_service.generate_answer("prompt")
 
     assert len(text) > 100
     assert tokens == 500
+
+
+def make_stream_chunk(content=None, total_tokens=None):
+    """Build a streamed completion chunk."""
+    choices = [] if content is None else [SimpleNamespace(delta=SimpleNamespace(content=content))]
+    usage = SimpleNamespace(total_tokens=total_tokens) if total_tokens is not None else None
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+async def fake_stream(*chunks):
+    """Async iterator over streamed chunks."""
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_stream_answer_yields_deltas_and_reports_usage(llm_service, mock_openai_client):
+    """Text deltas are yielded in order and usage comes from the final chunk."""
+    mock_openai_client.chat.completions.create.return_value = fake_stream(
+        make_stream_chunk("Hola"),
+        make_stream_chunk(""),
+        make_stream_chunk(", mundo"),
+        make_stream_chunk(total_tokens=42),
+    )
+    usage = []
+
+    parts = [part async for part in llm_service.stream_answer("Prompt", on_usage=usage.append)]
+
+    assert parts == ["Hola", ", mundo"]
+    assert usage == [42]
+    kwargs = mock_openai_client.chat.completions.create.call_args.kwargs
+    assert kwargs["stream"] is True
+    assert kwargs["stream_options"] == {"include_usage": True}
+
+
+@pytest.mark.asyncio
+async def test_stream_answer_wraps_api_errors(llm_service, mock_openai_client):
+    """Streaming failures surface as LLMServiceError."""
+    mock_openai_client.chat.completions.create.side_effect = Exception("API error")
+
+    with pytest.raises(LLMServiceError):
+        async for _ in llm_service.stream_answer("Prompt"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_generate_answer_coalesces_concurrent_identical_prompts(
+    llm_service, mock_openai_client
+):
+    """Concurrent calls with the same prompt share one completion."""
+    release = asyncio.Event()
+
+    async def slow_create(**kwargs):
+        await release.wait()
+        return make_chat_response("Respuesta", 9)
+
+    mock_openai_client.chat.completions.create.side_effect = slow_create
+
+    tasks = [asyncio.create_task(llm_service.generate_answer("Prompt")) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == [("Respuesta", 9)] * 3
+    mock_openai_client.chat.completions.create.assert_awaited_once()
+    assert llm_service._pending == {}
+
+
+@pytest.mark.asyncio
+async def test_generate_answer_cancelled_owner_fails_waiters_with_service_error(
+    llm_service, mock_openai_client
+):
+    """Cancelling the caller that issued the request gives other waiters an LLMServiceError."""
+
+    async def slow_create(**kwargs):
+        await asyncio.Event().wait()
+
+    mock_openai_client.chat.completions.create.side_effect = slow_create
+
+    owner = asyncio.create_task(llm_service.generate_answer("Prompt"))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(llm_service.generate_answer("Prompt"))
+    await asyncio.sleep(0)
+    owner.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await owner
+    with pytest.raises(LLMServiceError):
+        await waiter
+    assert llm_service._pending == {}
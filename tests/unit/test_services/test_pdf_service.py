@@ -1,6 +1,7 @@
 """Tests for PDF extraction service."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
@@ -9,21 +10,29 @@ from src.services.pdf_service import PDFService
 from src.utils.exceptions import PDFProcessingError
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def pdf_service():
-    """Create PDFService instance."""
-    return PDFService()
+    """Create PDFService instance shared by the module."""
+    service = PDFService()
+    yield service
+    service.close()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_pdf_path():
     """Path to sample test PDF."""
     return str(Path(__file__).parent.parent.parent / "fixtures" / "sample.pdf")
 
 
-def test_extract_text_from_spanish_pdf(pdf_service, sample_pdf_path):
+@pytest.fixture(scope="session")
+def extracted_sample_pages(sample_pdf_path):
+    """Pages of the sample PDF, extracted once for the read-only tests."""
+    return PDFService().extract_text_with_pages(sample_pdf_path)
+
+
+def test_extract_text_from_spanish_pdf(extracted_sample_pages):
     """Test extraction from Spanish PDF file."""
-    pages = pdf_service.extract_text_with_pages(sample_pdf_path)
+    pages = extracted_sample_pages
 
     # Should have 2 pages
     assert len(pages) == 2
@@ -37,9 +46,9 @@ def test_extract_text_from_spanish_pdf(pdf_service, sample_pdf_path):
     assert "español chileno" in pages[2]
 
 
-def test_extract_preserves_page_numbers(pdf_service, sample_pdf_path):
+def test_extract_preserves_page_numbers(extracted_sample_pages):
     """Test that page numbers are correctly tracked."""
-    pages = pdf_service.extract_text_with_pages(sample_pdf_path)
+    pages = extracted_sample_pages
 
     # Pages should be 1-indexed
     assert 1 in pages
@@ -47,9 +56,9 @@ def test_extract_preserves_page_numbers(pdf_service, sample_pdf_path):
     assert 0 not in pages
 
 
-def test_extract_returns_dict(pdf_service, sample_pdf_path):
+def test_extract_returns_dict(extracted_sample_pages):
     """Test that extract returns a dictionary."""
-    result = pdf_service.extract_text_with_pages(sample_pdf_path)
+    result = extracted_sample_pages
 
     assert isinstance(result, dict)
     assert all(isinstance(k, int) for k in result.keys())
@@ -64,10 +73,84 @@ def test_extract_nonexistent_file_raises_error(pdf_service):
     assert "No se pudo procesar" in str(exc_info.value)
 
 
-def test_extract_strips_whitespace(pdf_service, sample_pdf_path):
+def test_extract_strips_whitespace(extracted_sample_pages):
     """Test that extracted text has whitespace stripped."""
-    pages = pdf_service.extract_text_with_pages(sample_pdf_path)
+    pages = extracted_sample_pages
 
     for text in pages.values():
         # No leading/trailing whitespace
         assert text == text.strip()
+
+
+def test_extract_in_worker_processes_matches_serial(sample_pdf_path, monkeypatch):
+    """Test that splitting pages across processes yields the same text."""
+    serial = PDFService(max_workers=1)._extract_with_pdfplumber(sample_pdf_path)
+
+    monkeypatch.setattr("src.services.pdf_service.MIN_PAGES_FOR_PARALLEL", 1)
+    service = PDFService(max_workers=2)
+    try:
+        parallel = service._extract_with_pdfplumber(sample_pdf_path)
+    finally:
+        service.close()
+
+    assert parallel == serial
+
+
+def test_worker_pool_is_started_once_with_spawn():
+    """Test that concurrent callers share one pool of spawned worker processes."""
+    service = PDFService(max_workers=2)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            executors = set(pool.map(lambda _: service._get_executor(), range(8)))
+
+        assert len(executors) == 1
+        assert executors.pop()._mp_context.get_start_method() == "spawn"
+    finally:
+        service.close()
+
+
+def test_extract_uses_pdfium_text_matching_pdfplumber(pdf_service, sample_pdf_path):
+    """Test that the pypdfium2 path yields the same page text as pdfplumber."""
+    assert pdf_service._extract_with_pdfium(sample_pdf_path) == (
+        pdf_service._extract_with_pdfplumber(sample_pdf_path)
+    )
+
+
+def test_extract_falls_back_when_pdfium_fails(pdf_service, sample_pdf_path, monkeypatch):
+    """Test that a pypdfium2 failure falls back to pdfplumber."""
+
+    def fail(file_path):
+        raise RuntimeError("pdfium error")
+
+    monkeypatch.setattr(pdf_service, "_extract_with_pdfium", fail)
+
+    pages = pdf_service.extract_text_with_pages(sample_pdf_path)
+
+    assert "Objetivos del Proyecto" in pages[2]
+
+
+def test_iter_pages_streams_same_text_as_extract(
+    pdf_service, sample_pdf_path, extracted_sample_pages
+):
+    """Test that streaming pages yields the dictionary extraction in page order."""
+    assert list(pdf_service.iter_pages(sample_pdf_path)) == list(extracted_sample_pages.items())
+
+
+def test_concurrent_pdfium_extractions_match_serial(
+    pdf_service, sample_pdf_path, extracted_sample_pages
+):
+    """Test that extractions from several threads, as uploads run them, stay intact."""
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        streamed = pool.map(lambda _: list(pdf_service.iter_pages(sample_pdf_path)), range(4))
+        extracted = pool.map(lambda _: pdf_service._extract_with_pdfium(sample_pdf_path), range(4))
+
+        assert all(pages == list(extracted_sample_pages.items()) for pages in streamed)
+        assert all(pages == extracted_sample_pages for pages in extracted)
+
+
+def test_pypdf2_fallback_matches_page_numbers(pdf_service, sample_pdf_path):
+    """Test that the PyPDF2 fallback numbers pages from 1 like the other extractors."""
+    pages = pdf_service._extract_with_pypdf2(sample_pdf_path)
+
+    assert list(pages) == [1, 2]
+    assert "Objetivos del Proyecto" in pages[2]
@@ -1,43 +1,59 @@
 """Tests for RAG service."""
 
-from unittest.mock import AsyncMock
+import logging
+from dataclasses import FrozenInstanceError
+from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 import pytest
 
 from src.models.chunk import Chunk
+from src.services import rag_service as rag_module
 from src.services.rag_service import RAGService
+from src.utils.cache import SemanticCache
 from src.utils.exceptions import RAGSystemError
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def reset_default_document(monkeypatch):
+    """Forget the process-wide default logging document between tests."""
+    monkeypatch.setattr(rag_module, "_default_document_id", None)
+
+
+@pytest.fixture(scope="module")
 def mock_retrieval_service():
     """Create mock retrieval service."""
     service = AsyncMock()
     return service
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_llm_service():
     """Create mock LLM service."""
-    from unittest.mock import Mock
-
     service = Mock()
+    service.generate_answer = AsyncMock()
     return service
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_query_log_repo():
     """Create mock query log repository."""
     return AsyncMock()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_document_repo():
     """Create mock document repository."""
     return AsyncMock()
 
 
+@pytest.fixture(autouse=True)
+def reset_mocks(mock_retrieval_service, mock_llm_service, mock_query_log_repo, mock_document_repo):
+    """Start every test with the module-wide mocks unconfigured and uncalled."""
+    for mock in (mock_retrieval_service, mock_llm_service, mock_query_log_repo, mock_document_repo):
+        mock.reset_mock(return_value=True, side_effect=True)
+
+
 @pytest.fixture
 def rag_service(mock_retrieval_service, mock_llm_service, mock_query_log_repo, mock_document_repo):
     """Create RAG service with mocks."""
@@ -49,9 +65,9 @@ def rag_service(mock_retrieval_service, mock_llm_service, mock_query_log_repo, m
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_chunks():
-    """Create sample chunks for testing."""
+    """Create sample chunks shared by the module; tests only read them."""
     doc_id = uuid4()
     return [
         (
@@ -130,22 +146,28 @@ async def test_answer_question_with_document_id(
     )
 
 
+def test_build_prompt_contains_question_and_context(sample_chunks):
+    """Test that the prompt carries the question and the cited context."""
+    prompt = RAGService._build_prompt("¿Qué es RAG?", sample_chunks)
+
+    assert "¿Qué es RAG?" in prompt
+    assert "El sistema RAG" in prompt
+    assert "Página 1" in prompt
+
+
 @pytest.mark.asyncio
-async def test_answer_question_builds_prompt_with_context(
+async def test_answer_question_sends_built_prompt(
     rag_service, mock_retrieval_service, mock_llm_service, sample_chunks
 ):
-    """Test that answer_question builds prompt with context."""
+    """Test that answer_question sends the prompt built from the retrieved chunks."""
     mock_retrieval_service.retrieve_relevant_chunks.return_value = sample_chunks
     mock_llm_service.generate_answer.return_value = ("Respuesta", 100)
 
     await rag_service.answer_question("¿Qué es RAG?")
 
-    # Check that LLM was called with a prompt containing the question
-    call_args = mock_llm_service.generate_answer.call_args[0]
-    prompt = call_args[0]
-    assert "¿Qué es RAG?" in prompt
-    assert "El sistema RAG" in prompt
-    assert "Página 1" in prompt
+    mock_llm_service.generate_answer.assert_awaited_once_with(
+        RAGService._build_prompt("¿Qué es RAG?", sample_chunks)
+    )
 
 
 @pytest.mark.asyncio
@@ -161,7 +183,7 @@ async def test_answer_question_no_chunks_found(
     assert response.retrieved_chunks_count == 0
     assert response.tokens_used == 0
     assert "no encontré información relevante" in response.answer
-    mock_llm_service.generate_answer.assert_not_called()
+    mock_llm_service.generate_answer.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -182,51 +204,36 @@ async def test_answer_question_detects_not_answerable(
     assert response.tokens_used == 50
 
 
+@pytest.mark.parametrize(
+    "question,failing_call,message",
+    [
+        pytest.param("", None, "pregunta vacía", id="empty_question"),
+        pytest.param("   ", None, "pregunta vacía", id="whitespace_question"),
+        pytest.param("test", "retrieval", "Error al responder pregunta", id="retrieval_error"),
+        pytest.param("test", "llm", "Error al responder pregunta", id="llm_error"),
+    ],
+)
 @pytest.mark.asyncio
-async def test_answer_question_raises_error_for_empty_question(rag_service):
-    """Test that answer_question raises error for empty question."""
-    with pytest.raises(RAGSystemError) as exc_info:
-        await rag_service.answer_question("")
-
-    assert "pregunta vacía" in str(exc_info.value)
-
-
-@pytest.mark.asyncio
-async def test_answer_question_raises_error_for_whitespace_question(rag_service):
-    """Test that answer_question raises error for whitespace question."""
-    with pytest.raises(RAGSystemError) as exc_info:
-        await rag_service.answer_question("   ")
-
-    assert "pregunta vacía" in str(exc_info.value)
-
-
-@pytest.mark.asyncio
-async def test_answer_question_handles_retrieval_error(
-    rag_service, mock_retrieval_service
-):
-    """Test that answer_question handles retrieval errors."""
-    mock_retrieval_service.retrieve_relevant_chunks.side_effect = Exception(
-        "Retrieval failed"
-    )
-
-    with pytest.raises(RAGSystemError) as exc_info:
-        await rag_service.answer_question("test")
-
-    assert "Error al responder pregunta" in str(exc_info.value)
-
-
-@pytest.mark.asyncio
-async def test_answer_question_handles_llm_error(
-    rag_service, mock_retrieval_service, mock_llm_service, sample_chunks
+async def test_answer_question_errors(
+    rag_service,
+    mock_retrieval_service,
+    mock_llm_service,
+    sample_chunks,
+    question,
+    failing_call,
+    message,
 ):
-    """Test that answer_question handles LLM errors."""
+    """Test that invalid questions and failing dependencies raise RAGSystemError."""
     mock_retrieval_service.retrieve_relevant_chunks.return_value = sample_chunks
-    mock_llm_service.generate_answer.side_effect = Exception("LLM failed")
+    if failing_call == "retrieval":
+        mock_retrieval_service.retrieve_relevant_chunks.side_effect = Exception("Retrieval failed")
+    elif failing_call == "llm":
+        mock_llm_service.generate_answer.side_effect = Exception("LLM failed")
 
     with pytest.raises(RAGSystemError) as exc_info:
-        await rag_service.answer_question("test")
+        await rag_service.answer_question(question)
 
-    assert "Error al responder pregunta" in str(exc_info.value)
+    assert message in str(exc_info.value)
 
 
 @pytest.mark.asyncio
@@ -242,6 +249,39 @@ async def test_answer_question_extracts_chunk_ids(
     assert len(response.chunk_ids) == 2
     assert response.chunk_ids[0] == sample_chunks[0][0].id
     assert response.chunk_ids[1] == sample_chunks[1][0].id
+    assert isinstance(response.chunk_ids, tuple)
+
+
+@pytest.mark.asyncio
+async def test_answer_question_uses_semantic_cache(
+    mock_retrieval_service,
+    mock_llm_service,
+    mock_query_log_repo,
+    mock_document_repo,
+    sample_chunks,
+):
+    """Test that a repeated question is answered from the cache and still logged."""
+    service = RAGService(
+        retrieval_service=mock_retrieval_service,
+        llm_service=mock_llm_service,
+        query_log_repo=mock_query_log_repo,
+        document_repo=mock_document_repo,
+        answer_cache=SemanticCache(),
+    )
+    doc_id = uuid4()
+    mock_retrieval_service.embed_query.return_value = [1.0, 0.0]
+    mock_retrieval_service.retrieve_relevant_chunks.return_value = sample_chunks
+    mock_llm_service.generate_answer.return_value = ("Respuesta", 100)
+
+    first = await service.answer_question("¿Qué es RAG?", document_id=doc_id)
+    second = await service.answer_question("¿Qué es RAG?", document_id=doc_id)
+
+    assert second.answer == first.answer
+    assert second.chunk_ids == first.chunk_ids
+    assert (first.tokens_used, second.tokens_used) == (100, 0)
+    assert mock_llm_service.generate_answer.call_count == 1
+    mock_retrieval_service.retrieve_relevant_chunks.assert_awaited_once()
+    assert mock_query_log_repo.create.await_count == 2
 
 
 @pytest.mark.asyncio
@@ -249,7 +289,7 @@ async def test_rag_response_initialization():
     """Test RAGResponse initialization."""
     from src.services.rag_service import RAGResponse
 
-    chunk_ids = [uuid4(), uuid4()]
+    chunk_ids = (uuid4(), uuid4())
     response = RAGResponse(
         answer="Test answer",
         is_answerable=True,
@@ -263,3 +303,134 @@ async def test_rag_response_initialization():
     assert response.retrieved_chunks_count == 5
     assert response.tokens_used == 150
     assert response.chunk_ids == chunk_ids
+    with pytest.raises(FrozenInstanceError):
+        response.answer = "Otra respuesta"
+
+
+@pytest.mark.asyncio
+async def test_stream_answer_yields_llm_deltas_and_logs_query(
+    rag_service,
+    mock_retrieval_service,
+    mock_llm_service,
+    mock_query_log_repo,
+    sample_chunks,
+    monkeypatch,
+    caplog,
+):
+    """Streamed deltas are forwarded; the full answer and token usage are logged at the end."""
+    caplog.set_level(logging.INFO, logger="src.services.rag_service")
+
+    async def stream(prompt, on_usage=None):
+        for delta in ("El sistema ", "RAG [Página 1]"):
+            yield delta
+        on_usage(42)
+
+    mock_retrieval_service.retrieve_relevant_chunks.return_value = sample_chunks
+    monkeypatch.setattr(mock_llm_service, "stream_answer", stream)
+
+    deltas = await rag_service.stream_answer("¿Qué es RAG?", uuid4())
+    parts = [part async for part in deltas]
+
+    assert parts == ["El sistema ", "RAG [Página 1]"]
+    logged = mock_query_log_repo.create.call_args[0][0]
+    assert logged.answer_text == "El sistema RAG [Página 1]"
+    assert logged.is_answerable is True
+    assert "Streamed answer used 42 tokens" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_stream_answer_without_chunks_yields_fallback(
+    rag_service, mock_retrieval_service, mock_llm_service
+):
+    """No retrieved context streams the fallback answer without calling the LLM."""
+    mock_retrieval_service.retrieve_relevant_chunks.return_value = []
+
+    deltas = await rag_service.stream_answer("¿Qué es RAG?", uuid4())
+    parts = [part async for part in deltas]
+
+    assert parts == [RAGService.NO_CONTEXT_ANSWER]
+    mock_llm_service.stream_answer.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "question,failing_call,message",
+    [
+        pytest.param("   ", None, "pregunta vacía", id="whitespace_question"),
+        pytest.param("test", "retrieval", "Retrieval failed", id="retrieval_error"),
+        pytest.param("test", "llm", "LLM failed", id="llm_error"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_stream_answer_fails_before_streaming(
+    rag_service,
+    mock_retrieval_service,
+    mock_llm_service,
+    sample_chunks,
+    monkeypatch,
+    question,
+    failing_call,
+    message,
+):
+    """Errors up to the first LLM delta are raised when the stream is requested."""
+
+    async def stream(prompt, on_usage=None):
+        raise Exception("LLM failed")
+        yield
+
+    mock_retrieval_service.retrieve_relevant_chunks.return_value = sample_chunks
+    if failing_call == "retrieval":
+        mock_retrieval_service.retrieve_relevant_chunks.side_effect = Exception("Retrieval failed")
+    monkeypatch.setattr(mock_llm_service, "stream_answer", stream)
+
+    with pytest.raises(RAGSystemError, match=message):
+        await rag_service.stream_answer(question)
+
+
+@pytest.mark.asyncio
+async def test_answer_question_defers_log_to_background_tasks(
+    mock_retrieval_service, mock_llm_service, mock_query_log_repo, mock_document_repo
+):
+    """With background tasks the query log is written after the response."""
+    from fastapi import BackgroundTasks
+
+    background_tasks = BackgroundTasks()
+    service = RAGService(
+        retrieval_service=mock_retrieval_service,
+        llm_service=mock_llm_service,
+        query_log_repo=mock_query_log_repo,
+        document_repo=mock_document_repo,
+        background_tasks=background_tasks,
+    )
+    mock_retrieval_service.retrieve_relevant_chunks.return_value = []
+
+    await service.answer_question("¿Qué es RAG?", uuid4())
+
+    mock_query_log_repo.create.assert_not_awaited()
+    await background_tasks()
+    mock_query_log_repo.create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_default_log_document_is_looked_up_once(
+    rag_service, mock_retrieval_service, mock_document_repo
+):
+    """Queries without a document filter reuse the first document lookup."""
+    mock_document_repo.list_all.return_value = [Mock(id=uuid4())]
+    mock_retrieval_service.retrieve_relevant_chunks.return_value = []
+
+    await rag_service.answer_question("¿Qué es RAG?")
+    await rag_service.answer_question("¿Qué es un chunk?")
+
+    mock_document_repo.list_all.assert_awaited_once_with(limit=1)
+
+
+def test_build_prompt_matches_template_layout(sample_chunks):
+    """The prompt is the shared template with the context substituted exactly once."""
+    from src.core.prompts import format_context_from_chunks, format_prompt
+
+    context = format_context_from_chunks(sample_chunks)
+    prompt = RAGService._build_prompt("¿Qué es RAG?", sample_chunks)
+
+    assert prompt == format_prompt(context, "¿Qué es RAG?")
+    assert "{context}" not in prompt
+    assert prompt.count(context) == 1
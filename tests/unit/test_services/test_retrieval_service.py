@@ -1,16 +1,51 @@
 """Tests for retrieval service."""
 
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
 
 from src.models.chunk import Chunk
 from src.services.retrieval_service import RetrievalService
+from src.utils.cache import SemanticCache
 from src.utils.exceptions import RAGSystemError
 
+# Built once; embed_text returns a plain list of floats, like EmbeddingService
+FAKE_EMBEDDING = [0.1] * 1536
+
+# Three scored chunks in descending similarity, built once at import
+PRESET_CHUNKS = tuple(
+    (
+        Chunk(
+            id=UUID(int=i + 1),
+            document_id=UUID(int=0),
+            content=f"Chunk {i}",
+            page_number=i,
+            chunk_index=i,
+            word_count=2,
+        ),
+        0.9 - (i * 0.1),
+    )
+    for i in range(3)
+)
 
-@pytest.fixture
+
+class AsyncStub:
+    """Awaitable stand-in that records its calls and returns (or raises) one value."""
+
+    def __init__(self, result=None):
+        self.result = result
+        self.calls = []
+
+    async def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+@pytest.fixture(scope="module")
 def mock_vector_repo():
     """Create mock vector repository."""
     repo = AsyncMock()
@@ -19,10 +54,14 @@ def mock_vector_repo():
 
 @pytest.fixture
 def mock_embedding_service():
-    """Create mock embedding service."""
-    service = Mock()
-    service.embed_text = Mock(return_value=[0.1] * 1536)
-    return service
+    """Create stub embedding service returning FAKE_EMBEDDING."""
+    return SimpleNamespace(embed_text=AsyncStub(FAKE_EMBEDDING))
+
+
+@pytest.fixture(autouse=True)
+def reset_mocks(mock_vector_repo):
+    """Start every test with the module-wide mock in its default state."""
+    mock_vector_repo.reset_mock(return_value=True, side_effect=True)
 
 
 @pytest.fixture
@@ -57,7 +96,7 @@ async def test_retrieve_relevant_chunks_returns_results(
     assert len(results) == 1
     assert results[0][0].content == "Test content"
     assert results[0][1] == 0.85
-    mock_embedding_service.embed_text.assert_called_once_with("test query")
+    assert mock_embedding_service.embed_text.calls == [(("test query",), {})]
 
 
 @pytest.mark.asyncio
@@ -128,7 +167,7 @@ async def test_retrieve_handles_embedding_service_error(
     retrieval_service, mock_embedding_service
 ):
     """Test that retrieve handles embedding service errors."""
-    mock_embedding_service.embed_text.side_effect = Exception("API error")
+    mock_embedding_service.embed_text.result = Exception("API error")
 
     with pytest.raises(RAGSystemError) as exc_info:
         await retrieval_service.retrieve_relevant_chunks("test query")
@@ -154,22 +193,7 @@ async def test_retrieve_returns_multiple_chunks_ordered(
     retrieval_service, mock_vector_repo, mock_embedding_service
 ):
     """Test that retrieve returns multiple chunks in order."""
-    doc_id = uuid4()
-    chunks = [
-        (
-            Chunk(
-                id=uuid4(),
-                document_id=doc_id,
-                content=f"Chunk {i}",
-                page_number=i,
-                chunk_index=i,
-                word_count=2,
-            ),
-            0.9 - (i * 0.1),
-        )
-        for i in range(3)
-    ]
-    mock_vector_repo.similarity_search.return_value = chunks
+    mock_vector_repo.similarity_search.return_value = list(PRESET_CHUNKS)
 
     results = await retrieval_service.retrieve_relevant_chunks("test query")
 
@@ -189,3 +213,25 @@ async def test_retrieve_returns_empty_when_no_matches(
     results = await retrieval_service.retrieve_relevant_chunks("test query")
 
     assert len(results) == 0
+
+
+@pytest.mark.asyncio
+async def test_retrieve_relevant_chunks_reuses_semantic_cache(
+    mock_vector_repo, mock_embedding_service
+):
+    """Test that a repeated query is served from the semantic cache."""
+    results = [(Mock(spec=Chunk), 0.9)]
+    mock_vector_repo.similarity_search.return_value = results
+    mock_embedding_service.embed_text.result = [1.0, 0.0]
+    service = RetrievalService(
+        vector_repo=mock_vector_repo,
+        embedding_service=mock_embedding_service,
+        semantic_cache=SemanticCache(),
+    )
+
+    first = await service.retrieve_relevant_chunks("¿Qué es  RAG?")
+    second = await service.retrieve_relevant_chunks("¿Qué es RAG?")
+
+    assert first == second == results
+    mock_vector_repo.similarity_search.assert_awaited_once()
+    assert mock_embedding_service.embed_text.calls[-1] == (("¿Qué es RAG?",), {})
@@ -0,0 +1,155 @@
+"""Tests for in-process caching utilities."""
+
+from uuid import uuid4
+
+import numpy as np
+
+from src.utils.cache import LRUCache, SemanticCache
+
+
+def test_lru_cache_returns_stored_value():
+    """Test that stored values can be read back."""
+    cache = LRUCache(max_size=2)
+    cache.set("a", [0.1])
+
+    assert cache.get("a") == [0.1]
+    assert "a" in cache
+    assert len(cache) == 1
+
+
+def test_lru_cache_returns_none_for_missing_key():
+    """Test that missing keys return None."""
+    cache = LRUCache(max_size=2)
+
+    assert cache.get("missing") is None
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that the least recently used entry is evicted when full."""
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" becomes least recently used
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_lru_cache_clear():
+    """Test that clear empties the cache."""
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.clear()
+
+    assert len(cache) == 0
+
+
+def test_semantic_cache_hits_for_similar_embedding():
+    """Test that a near-identical query embedding returns the cached value."""
+    cache = SemanticCache(threshold=0.97)
+    scope = (None, 5, 0.3)
+    cache.set(scope, [1.0, 0.0], "resultados")
+
+    assert cache.get(scope, [0.99, 0.141]) == "resultados"
+    assert cache.get(scope, [0.0, 1.0]) is None
+    assert cache.get((None, 3, 0.3), [1.0, 0.0]) is None
+
+
+def test_semantic_cache_compares_direction_not_length():
+    """Test that embeddings are normalized, so scaled copies still hit."""
+    cache = SemanticCache(threshold=0.97)
+    scope = (None, 5, 0.3)
+    cache.set(scope, [3.0, 4.0], "resultados")
+
+    assert cache.get(scope, [0.6, 0.8]) == "resultados"
+    assert cache.get(scope, [30.0, 40.0]) == "resultados"
+    assert cache.get(scope, [4.0, -3.0]) is None
+
+
+def test_semantic_cache_expires_entries(monkeypatch):
+    """Test that entries older than the TTL are not returned."""
+    now = [100.0]
+    monkeypatch.setattr("src.utils.cache.time.monotonic", lambda: now[0])
+    cache = SemanticCache(ttl_seconds=10)
+    cache.set((None, 5, 0.3), [1.0, 0.0], "resultados")
+
+    now[0] = 111.0
+
+    assert cache.get((None, 5, 0.3), [1.0, 0.0]) is None
+
+
+def test_semantic_cache_skips_expired_best_match(monkeypatch):
+    """Test that an expired closer entry does not hide a live one above the threshold."""
+    now = [100.0]
+    monkeypatch.setattr("src.utils.cache.time.monotonic", lambda: now[0])
+    cache = SemanticCache(threshold=0.97, ttl_seconds=10)
+    scope = (None, 5, 0.3)
+    cache.set(scope, [1.0, 0.0], "antiguo")
+    now[0] = 105.0
+    cache.set(scope, [0.99, 0.141], "vigente")
+
+    now[0] = 111.0
+
+    assert cache.get(scope, [1.0, 0.0]) == "vigente"
+    now[0] = 116.0
+    assert cache.get(scope, [1.0, 0.0]) is None
+
+
+def test_semantic_cache_evicts_least_recently_used():
+    """Test that a full scope drops its least recently used entry."""
+    cache = SemanticCache(max_size=2)
+    scope = (None, 5, 0.3)
+    cache.set(scope, [1.0, 0.0], "a")
+    cache.set(scope, [0.0, 1.0], "b")
+    cache.get(scope, [1.0, 0.0])  # "b" becomes least recently used
+    cache.set(scope, [-1.0, 0.0], "c")
+
+    assert cache.get(scope, [1.0, 0.0]) == "a"
+    assert cache.get(scope, [0.0, 1.0]) is None
+
+
+def test_semantic_cache_invalidates_document_and_unfiltered_scopes():
+    """Test that a document change drops its own and unfiltered results only."""
+    changed, other = uuid4(), uuid4()
+    cache = SemanticCache()
+    for document_id in (None, changed, other):
+        cache.set((document_id, 5, 0.3), [1.0, 0.0], document_id)
+
+    cache.invalidate(changed)
+
+    assert cache.get((None, 5, 0.3), [1.0, 0.0]) is None
+    assert cache.get((changed, 5, 0.3), [1.0, 0.0]) is None
+    assert cache.get((other, 5, 0.3), [1.0, 0.0]) == other
+
+
+def test_semantic_cache_grows_past_initial_capacity():
+    """Test that entries beyond the preallocated rows stay retrievable."""
+    cache = SemanticCache(max_size=64)
+    scope = (None, 5, 0.3)
+    vectors = np.eye(40, dtype=np.float32)
+    for i, vector in enumerate(vectors):
+        cache.set(scope, vector.tolist(), i)
+
+    assert [cache.get(scope, vector.tolist()) for vector in vectors] == list(range(40))
+
+
+def test_semantic_cache_int8_scores_track_float_cosine():
+    """Test that quantized lookups separate hits from misses around the threshold."""
+    rng = np.random.default_rng(0)
+    base = rng.standard_normal(1536).astype(np.float32)
+    base /= np.linalg.norm(base)
+    noise = rng.standard_normal(1536).astype(np.float32)
+    noise -= noise.dot(base) * base
+    noise /= np.linalg.norm(noise)
+    cache = SemanticCache(threshold=0.97)
+    scope = (None, 5, 0.3)
+    cache.set(scope, base.tolist(), "resultados")
+
+    # Exact cosines of 0.99 and 0.95 against the stored query
+    near = 0.99 * base + np.sqrt(1 - 0.99**2) * noise
+    far = 0.95 * base + np.sqrt(1 - 0.95**2) * noise
+
+    assert cache.get(scope, near.tolist()) == "resultados"
+    assert cache.get(scope, far.tolist()) is None
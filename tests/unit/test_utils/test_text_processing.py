@@ -1,7 +1,22 @@
 """Tests for text processing utilities."""
 
+from unittest.mock import Mock
+
+import pytest
+
+from src.utils import text_processing
 from src.utils.text_processing import clean_text, count_tokens
 
+LONG_TEXT = "Este es un documento más largo con múltiples oraciones. " * 10
+
+
+@pytest.fixture(autouse=True)
+def clear_encoding_cache():
+    """Keep encodings resolved by other tests from leaking into this one."""
+    text_processing._get_encoding.cache_clear()
+    yield
+    text_processing._get_encoding.cache_clear()
+
 
 def test_clean_text_removes_extra_whitespace():
     """Test that clean_text removes extra whitespace."""
@@ -48,6 +63,11 @@ def test_clean_text_chilean_spanish():
     assert cleaned == "¿Cuál es el cacho?"
 
 
+def test_clean_text_collapses_unicode_whitespace():
+    """Test that non-breaking and other Unicode spaces collapse like ASCII ones."""
+    assert clean_text("\u00a0Hola\u2003\u2003mundo\r\n\x0c") == "Hola mundo"
+
+
 def test_count_tokens_simple_text():
     """Test token counting for simple text."""
     text = "Hello world"
@@ -84,7 +104,34 @@ def test_count_tokens_with_model():
 
 def test_count_tokens_long_text():
     """Test token counting for longer text."""
-    text = "Este es un documento más largo con múltiples oraciones. " * 10
-    token_count = count_tokens(text)
+    token_count = count_tokens(LONG_TEXT)
     # Should have many tokens
     assert token_count > 50
+
+
+def test_count_tokens_resolves_encoding_once(monkeypatch):
+    """Test that the tiktoken encoding is looked up once per model."""
+    encoding = Mock()
+    encoding.encode.side_effect = lambda text: text.split()
+    encoding_for_model = Mock(return_value=encoding)
+    monkeypatch.setattr(text_processing.tiktoken, "encoding_for_model", encoding_for_model)
+
+    assert count_tokens("uno dos", model="test-model") == 2
+    assert count_tokens("uno dos tres", model="test-model") == 3
+
+    encoding_for_model.assert_called_once_with("test-model")
+
+
+def test_count_tokens_maps_openai_models_to_cl100k(monkeypatch):
+    """Test that known OpenAI models skip tiktoken's model-name lookup."""
+    encoding = Mock()
+    encoding.encode.return_value = [1, 2]
+    get_encoding = Mock(return_value=encoding)
+    encoding_for_model = Mock()
+    monkeypatch.setattr(text_processing.tiktoken, "get_encoding", get_encoding)
+    monkeypatch.setattr(text_processing.tiktoken, "encoding_for_model", encoding_for_model)
+
+    assert count_tokens("hola", model="text-embedding-3-small") == 2
+
+    get_encoding.assert_called_once_with("cl100k_base")
+    encoding_for_model.assert_not_called()
@@ -75,3 +75,11 @@ def test_validate_file_size_custom_limit():
     # Should fail with 2 MB limit
     with pytest.raises(FileSizeExceededError):
         validate_file_size(file_size, max_size_mb=2)
+
+
+def test_validate_file_type_ignores_dots_in_directories():
+    """Test that only the final path component's extension is checked."""
+    validate_file_type("/tmp/v1.2/document.pdf")
+
+    with pytest.raises(InvalidFileTypeError):
+        validate_file_type("/tmp/v1.pdf/document")